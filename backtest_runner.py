@@ -6,14 +6,26 @@ Run comprehensive backtests to evaluate and tune strategy performance.
 """
 
 import yfinance as yf
+import matplotlib
+matplotlib.use('Agg')  # Headless backend; must be selected before pyplot is imported
+import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
 import logging
 import yaml
 import argparse
+import time
+import itertools
+import heapq
+import hashlib
+import copy
+import functools
+import pickle
 from datetime import datetime, timedelta
 from pathlib import Path
 import json
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict
 from typing import Dict, List
 
 # Import our modules
@@ -27,9 +39,40 @@ from src.visualization.chart_generator import ChartGenerator
 # Import indicator calculations from main bot
 from enhanced_multi_strategy_bot import (
     calculate_multiple_rsi, calculate_multiple_ema, 
-    calculate_bollinger_bands, calculate_macd, generate_legacy_signal
+    calculate_bollinger_bands, calculate_macd, generate_legacy_signal,
+    score_legacy_signals, LEGACY_COLS, _extend_cached, hash_sources
 )
 
+# Maximum number of tickers per yf.download request
+DOWNLOAD_BATCH_SIZE = 20
+
+# Parquet cache for downloaded OHLCV frames
+OHLCV_CACHE_DIR = Path("cache/ohlcv")
+CACHE_MAX_AGE = {
+    'none': None,
+    'day': 24 * 60 * 60,
+    'week': 7 * 24 * 60 * 60,
+    'month': 30 * 24 * 60 * 60
+}
+
+# Pickled backtest results keyed by data, backtest config, strategy config and code
+BACKTEST_CACHE_DIR = Path("cache/backtests")
+
+# Sources whose changes invalidate cached backtest results; the strategies
+# depend on the calculators, kernels and models throughout src/
+BACKTEST_CODE_PATHS = [
+    Path(__file__).parent / "src",
+    Path(__file__).parent / "backtest_runner.py",
+    Path(__file__).parent / "enhanced_multi_strategy_bot.py",
+]
+
+# Parsed YAML configs keyed by (path, mtime)
+_config_cache = {}
+
+# Strategy signals keyed by (strategy params, symbol, bar date), shared by all
+# signal generators over one dataset; cleared when a worker gets new data
+_signal_cache = {}
+
 
 def setup_logging(verbose=False):
     """Setup logging for backtesting."""
@@ -47,10 +90,18 @@ def setup_logging(verbose=False):
 
 
 def load_backtest_config(config_file: str = None) -> Dict:
-    """Load backtesting configuration."""
+    """Load backtesting configuration.
+    
+    Parsed YAML files are cached by path and modification time, so repeated
+    loads only pay for a copy of the dict.
+    """
     if config_file and Path(config_file).exists():
-        with open(config_file, 'r') as f:
-            return yaml.safe_load(f)
+        path = Path(config_file).resolve()
+        cache_key = (path, path.stat().st_mtime_ns)
+        if cache_key not in _config_cache:
+            with open(path, 'r') as f:
+                _config_cache[cache_key] = yaml.safe_load(f)
+        return copy.deepcopy(_config_cache[cache_key])
     
     # Default configuration
     return {
@@ -94,130 +145,470 @@ def load_backtest_config(config_file: str = None) -> Dict:
     }
 
 
+def _ohlcv_cache_path(symbol: str, start_date: str, end_date: str = None) -> Path:
+    """Get the parquet cache file for a symbol and date range."""
+    return OHLCV_CACHE_DIR / f"{symbol}_{start_date}_{end_date or 'now'}.parquet"
+
+
+def _match_tz(ts: pd.Timestamp, index: pd.DatetimeIndex) -> pd.Timestamp:
+    """Localize a naive timestamp to the index timezone so the two compare."""
+    if index.tz is not None and ts.tz is None:
+        return ts.tz_localize(index.tz)
+    return ts
+
+
+def _download_batch(batch: List[str], start_date: str, end_date: str = None) -> Dict[str, pd.DataFrame]:
+    """Download OHLCV data for a batch of symbols with a single yf.download call."""
+    logger = logging.getLogger(__name__)
+    
+    raw = yf.download(
+        batch,
+        start=start_date,
+        end=end_date or None,
+        group_by='ticker',
+        threads=True,
+        auto_adjust=True,
+        progress=False
+    )
+    
+    if not isinstance(raw.columns, pd.MultiIndex):
+        # Older yfinance versions return flat columns for a single ticker
+        if len(batch) == 1:
+            return {batch[0]: raw.dropna(how='all')}
+        # Flat columns for several tickers cannot be told apart, so fetch them one by one
+        logger.warning(f"Batch download returned ungrouped data, fetching {len(batch)} symbols individually")
+        frames = {}
+        for symbol in batch:
+            try:
+                frames.update(_download_batch([symbol], start_date, end_date))
+            except Exception as e:
+                logger.error(f"Error fetching data for {symbol}: {e}")
+        return frames
+    
+    frames = {}
+    for symbol in batch:
+        if symbol not in raw.columns.get_level_values(0):
+            logger.warning(f"No data returned for {symbol}")
+            continue
+        frames[symbol] = raw[symbol].dropna(how='all')
+    
+    return frames
+
+
+def _write_ohlcv_cache(frames: Dict[str, pd.DataFrame], start_date: str, end_date: str = None):
+    """Write downloaded OHLCV frames to the parquet cache."""
+    logger = logging.getLogger(__name__)
+    
+    OHLCV_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    for symbol, data in frames.items():
+        try:
+            data.to_parquet(_ohlcv_cache_path(symbol, start_date, end_date), compression='zstd')
+        except Exception as e:
+            logger.warning(f"Failed to cache data for {symbol}: {e}")
+
+
+def _download_in_batches(symbols: List[str], start_date: str, end_date: str = None,
+                         on_batch=None) -> Dict[str, pd.DataFrame]:
+    """Download OHLCV data in batches of DOWNLOAD_BATCH_SIZE symbols.
+    
+    Args:
+        on_batch: Optional callback receiving each batch's frames as soon as it
+            is downloaded.
+    """
+    logger = logging.getLogger(__name__)
+    frames = {}
+    
+    batches = [symbols[i:i + DOWNLOAD_BATCH_SIZE] for i in range(0, len(symbols), DOWNLOAD_BATCH_SIZE)]
+    
+    for batch_num, batch in enumerate(batches, 1):
+        try:
+            logger.info(f"Downloading batch {batch_num}/{len(batches)} ({len(batch)} symbols)...")
+            batch_frames = _download_batch(batch, start_date, end_date)
+            if on_batch is not None:
+                on_batch(batch_frames)
+            frames.update(batch_frames)
+        except Exception as e:
+            logger.error(f"Error fetching data for batch {batch_num} ({', '.join(batch)}): {e}")
+            continue
+    
+    return frames
+
+
 def fetch_historical_data(symbols: List[str], start_date: str, end_date: str = None, 
-                         min_threshold: int = 500) -> Dict[str, pd.DataFrame]:
-    """Fetch historical data for backtesting."""
+                         min_threshold: int = 500, cache: str = "none") -> Dict[str, pd.DataFrame]:
+    """Fetch historical data for backtesting.
+    
+    Symbols are downloaded in batches of DOWNLOAD_BATCH_SIZE with a single
+    yf.download call per batch instead of one Ticker.history call per symbol.
+    Symbols below min_threshold (before or after date filtering) are dropped
+    before indicators are calculated. Symbols sharing a trading calendar are
+    stacked and processed together, with calendar groups run in a process pool.
+    
+    Args:
+        cache: OHLCV cache policy - 'none' disables the parquet cache, 'day',
+            'week' and 'month' reuse cached frames younger than that. Stale frames for
+            open-ended ranges are topped up with the bars from their tail on, and
+            downloaded in full if the overlapping bar shows the prices were readjusted.
+    """
     logger = logging.getLogger(__name__)
-    data_dict = {}
+    raw_frames = {}
     
     logger.info(f"Fetching data for {len(symbols)} symbols from {start_date} to {end_date or 'present'}")
     
-    for i, symbol in enumerate(symbols, 1):
-        try:
-            logger.info(f"Fetching {symbol} ({i}/{len(symbols)})...")
-            
-            ticker = yf.Ticker(symbol)
-            
-            # Determine period
-            if end_date:
-                data = ticker.history(start=start_date, end=end_date)
+    max_age = CACHE_MAX_AGE[cache]
+    downloaded = {}
+    stale_frames = {}
+    to_download = []
+    
+    # Date bounds are resolved once rather than per symbol
+    now = time.time()
+    start_ts = pd.Timestamp(start_date) if start_date else None
+    end_ts = pd.Timestamp(end_date) if end_date else None
+    
+    for symbol in symbols:
+        cache_path = _ohlcv_cache_path(symbol, start_date, end_date)
+        if max_age is not None and cache_path.exists():
+            try:
+                is_fresh = now - cache_path.stat().st_mtime < max_age
+                # Stale frames are only worth reading when they can be topped up
+                if is_fresh or end_date is None:
+                    cached = pd.read_parquet(cache_path)
+                    if is_fresh:
+                        downloaded[symbol] = cached
+                        continue
+                    if not cached.empty:
+                        stale_frames[symbol] = cached
+                        continue
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable cache file {cache_path}: {e}")
+        to_download.append(symbol)
+    
+    if downloaded:
+        logger.info(f"Loaded {len(downloaded)} symbols from OHLCV cache")
+    
+    # Cache each batch as soon as it arrives so an interrupted run resumes from
+    # the batches that already completed instead of downloading them again
+    on_batch = None
+    if max_age is not None:
+        on_batch = functools.partial(_write_ohlcv_cache, start_date=start_date, end_date=end_date)
+    
+    fresh = _download_in_batches(to_download, start_date, end_date, on_batch) if to_download else {}
+    
+    if stale_frames:
+        # Request from the oldest cached tail so each symbol's last cached bar is
+        # downloaded again and can be checked for a split/dividend adjustment
+        tail_start = min(frame.index[-1] for frame in stale_frames.values())
+        logger.info(f"Updating {len(stale_frames)} cached symbols from {tail_start.strftime('%Y-%m-%d')}")
+        increments = _download_in_batches(list(stale_frames), tail_start.strftime('%Y-%m-%d'))
+        topped_up = {}
+        readjusted = []
+        for symbol, cached in stale_frames.items():
+            new_rows = increments.get(symbol)
+            if new_rows is None or new_rows.empty:
+                topped_up[symbol] = cached
+                continue
+            extended = _extend_cached(cached, new_rows)
+            if extended is None:
+                readjusted.append(symbol)
             else:
-                # Calculate period from start_date to now
-                start_dt = pd.to_datetime(start_date)
-                days_diff = (datetime.now() - start_dt).days
-                
-                if days_diff > 365 * 5:
-                    period = "max"
-                elif days_diff > 365 * 2:
-                    period = "5y"
-                elif days_diff > 365:
-                    period = "2y"
-                else:
-                    period = "1y"
-                
-                data = ticker.history(period=period)
+                topped_up[symbol] = extended
+        
+        _write_ohlcv_cache(topped_up, start_date, end_date)
+        fresh.update(topped_up)
+        
+        if readjusted:
+            # Adjusted prices were rescaled since the cache was written, so the
+            # cached history can't be extended and is downloaded again in full
+            logger.info(f"Refetching {len(readjusted)} symbols with readjusted history")
+            fresh.update(_download_in_batches(readjusted, start_date, end_date, on_batch))
+    
+    downloaded.update(fresh)
+    
+    for symbol in symbols:
+        if symbol not in downloaded:
+            continue
+        
+        try:
+            data = downloaded[symbol]
             
             if data.empty or len(data) < min_threshold:
                 logger.warning(f"Insufficient data for {symbol}: {len(data)} records")
                 continue
             
-            # Filter by date range if specified
-            if start_date:
-                data = data[data.index >= start_date]
-            if end_date:
-                data = data[data.index <= end_date]
+            if not data.index.is_monotonic_increasing:
+                data = data.sort_index()
             
-            if len(data) < min_threshold:
-                logger.warning(f"Insufficient data after date filtering for {symbol}: {len(data)} records")
-                continue
+            # Locate the date range by binary search on the sorted index so symbols
+            # that fall short are dropped before any slicing or indicator work
+            first = data.index.searchsorted(_match_tz(start_ts, data.index), side='left') if start_ts is not None else 0
+            last = data.index.searchsorted(_match_tz(end_ts, data.index), side='right') if end_ts is not None else len(data)
             
-            # Calculate indicators
-            data = add_indicators(data)
+            bars_in_range = last - first
+            if bars_in_range < min_threshold:
+                logger.warning(f"Insufficient data after date filtering for {symbol}: {bars_in_range} records")
+                continue
             
-            data_dict[symbol] = data
-            logger.debug(f"Loaded {symbol}: {len(data)} records from {data.index[0]} to {data.index[-1]}")
+            raw_frames[symbol] = data.iloc[first:last]
             
         except Exception as e:
-            logger.error(f"Error fetching data for {symbol}: {e}")
+            logger.error(f"Error processing data for {symbol}: {e}")
             continue
     
+    # Group symbols on the same trading calendar so their indicators are
+    # calculated in one vectorized pass and they share one DatetimeIndex object
+    groups = []
+    for symbol, data in raw_frames.items():
+        for index, group in groups:
+            if data.index.equals(index):
+                group[symbol] = data
+                break
+        else:
+            groups.append((data.index, {symbol: data}))
+    
+    # Calendar groups are independent of each other, so spread them over a pool
+    indicator_frames = {}
+    if groups:
+        with ProcessPoolExecutor() as executor:
+            futures = {executor.submit(add_indicators_batch, group): list(group) for _, group in groups}
+            for future in as_completed(futures):
+                try:
+                    indicator_frames.update(future.result())
+                except Exception as e:
+                    logger.error(f"Error calculating indicators for {', '.join(futures[future])}: {e}")
+    
+    # Preserve the requested symbol order for the backtest engine
+    data_dict = {}
+    for symbol in raw_frames:
+        if symbol in indicator_frames:
+            data = indicator_frames[symbol]
+            # Lets the signal cache key on the symbol rather than hashing the data
+            data.attrs['symbol'] = symbol
+            data_dict[symbol] = data
+            logger.debug(f"Loaded {symbol}: {len(data)} records from {data.index[0]} to {data.index[-1]}")
+    
     logger.info(f"Successfully loaded data for {len(data_dict)} symbols")
     return data_dict
 
 
-def add_indicators(data: pd.DataFrame) -> pd.DataFrame:
-    """Add technical indicators to price data."""
+def _indicator_columns(close) -> Dict:
+    """Calculate indicator columns for a Close series or a (dates x symbols) Close frame."""
+    # Collect all indicator columns first and attach them in a single concat
+    new_cols = {}
+    
     # RSI
-    rsi_values = calculate_multiple_rsi(data['Close'])
-    for key, values in rsi_values.items():
-        data[key] = values
+    new_cols.update(calculate_multiple_rsi(close))
     
     # EMA
-    ema_values = calculate_multiple_ema(data['Close'])
-    for key, values in ema_values.items():
-        data[key] = values
+    new_cols.update(calculate_multiple_ema(close))
     
     # Bollinger Bands
-    data['BB_Upper'], data['BB_Middle'], data['BB_Lower'] = calculate_bollinger_bands(data['Close'])
+    new_cols['BB_Upper'], new_cols['BB_Middle'], new_cols['BB_Lower'] = calculate_bollinger_bands(close)
     
     # MACD
-    data['MACD'], data['MACD_Signal'], data['MACD_Histogram'] = calculate_macd(data['Close'])
+    new_cols['MACD'], new_cols['MACD_Signal'], new_cols['MACD_Histogram'] = calculate_macd(close)
+    
+    return new_cols
+
+
+def _legacy_signal_columns(data: pd.DataFrame, indicators: pd.DataFrame) -> pd.DataFrame:
+    """Score the legacy strategy for every bar in one vectorized pass."""
+    # Stacked feature-major and transposed, so each feature stays contiguous
+    values = np.stack([
+        data['Close'].to_numpy(dtype=np.float64) if name == 'Close' else indicators[name].to_numpy(dtype=np.float64)
+        for name in LEGACY_COLS
+    ]).T
+    signals, scores = score_legacy_signals(values)
+    
+    return pd.DataFrame({'Legacy_Signal': pd.Categorical(signals), 'Legacy_Score': scores.astype(np.int8)},
+                        index=data.index)
+
+
+def add_indicators(data: pd.DataFrame) -> pd.DataFrame:
+    """Add technical indicators to price data."""
+    new_cols = _indicator_columns(data['Close'])
+    
+    # Indicators only feed threshold comparisons, so float32 is precise enough and
+    # halves their memory; OHLCV stays float64 for position sizing and P&L
+    indicators = pd.DataFrame(new_cols, index=data.index).astype(np.float32)
     
-    return data
+    return pd.concat([data, indicators, _legacy_signal_columns(data, indicators)], axis=1)
+
+
+def add_indicators_batch(frames: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """Add technical indicators to frames that share one DatetimeIndex.
+    
+    Closes are stacked into a single (dates x symbols) frame so every indicator
+    is computed for all symbols in one column-wise pass, then split back into
+    per-symbol frames for the backtest engine.
+    """
+    symbols = list(frames)
+    index = frames[symbols[0]].index
+    closes = pd.DataFrame({symbol: frames[symbol]['Close'].to_numpy() for symbol in symbols}, index=index)
+    
+    new_cols = _indicator_columns(closes)
+    names = list(new_cols)
+    
+    # (dates, symbols, indicators) so each symbol's block is a single slice
+    stacked = np.stack([new_cols[name].to_numpy(dtype=np.float32) for name in names], axis=2)
+    
+    result = {}
+    for j, symbol in enumerate(symbols):
+        data = frames[symbol].set_axis(index)
+        indicators = pd.DataFrame(stacked[:, j, :], index=index, columns=names)
+        result[symbol] = pd.concat([data, indicators, _legacy_signal_columns(data, indicators)], axis=1)
+    
+    return result
+
+
+def _data_fingerprint(data: pd.DataFrame) -> bytes:
+    """Hash the OHLC values and dates of a frame so equal slices share a key."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(data.index.asi8.tobytes())
+    for column in ('Open', 'High', 'Low', 'Close'):
+        if column in data.columns:
+            digest.update(data[column].to_numpy(dtype=np.float64).tobytes())
+    return digest.digest()
+
+
+def _dataset_fingerprint(data_dict: Dict[str, pd.DataFrame]) -> bytes:
+    """Hash every symbol's OHLC data into a single key for a backtest dataset."""
+    digest = hashlib.blake2b(digest_size=16)
+    for symbol, data in data_dict.items():
+        digest.update(symbol.encode())
+        digest.update(_data_fingerprint(data))
+    return digest.digest()
+
+
+@functools.lru_cache(maxsize=None)
+def _code_fingerprint() -> bytes:
+    """Hash the strategy and backtest sources so code changes invalidate cached results."""
+    return hash_sources(BACKTEST_CODE_PATHS)
+
+
+def _run_backtest_cached(engine: BacktestEngine, data_dict: Dict[str, pd.DataFrame], signal_generator,
+                         strategies: Dict, start_date: str = None, end_date: str = None,
+                         max_age: int = None, dataset_key: bytes = None):
+    """Run a backtest, reusing a pickled result for identical data, configuration and code.
+    
+    Args:
+        strategies: Strategy configuration the signal generator was built from
+        max_age: Maximum age in seconds of a reusable result; None disables the cache
+        dataset_key: Precomputed _dataset_fingerprint(data_dict), if available
+    """
+    logger = logging.getLogger(__name__)
+    
+    if max_age is None:
+        return engine.run_backtest(data_dict, signal_generator, start_date, end_date)
+    
+    if dataset_key is None:
+        dataset_key = _dataset_fingerprint(data_dict)
+    
+    key = hashlib.blake2b(digest_size=16)
+    key.update(dataset_key)
+    key.update(_code_fingerprint())
+    key.update(repr(sorted(asdict(engine.config).items())).encode())
+    key.update(json.dumps(strategies, sort_keys=True, default=str).encode())
+    key.update(f"{start_date}|{end_date}".encode())
+    cache_path = BACKTEST_CACHE_DIR / f"bt_{key.hexdigest()}.pkl"
+    
+    if cache_path.exists() and time.time() - cache_path.stat().st_mtime < max_age:
+        try:
+            with open(cache_path, 'rb') as f:
+                logger.info(f"Reusing cached backtest result {cache_path.name}")
+                return pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable backtest cache file {cache_path}: {e}")
+    
+    result = engine.run_backtest(data_dict, signal_generator, start_date, end_date)
+    
+    try:
+        BACKTEST_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(cache_path, 'wb') as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception as e:
+        logger.warning(f"Failed to cache backtest result: {e}")
+    
+    return result
+
+
+def _cached_strategy_signal(strategy, strategy_key: tuple, data: pd.DataFrame):
+    """Generate a strategy signal, reusing the result for identical params, symbol and bar.
+    
+    The engine passes each symbol's history up to the current bar, so within one
+    dataset the symbol (from data.attrs) and last bar date identify the data.
+    Frames without a symbol are not cached.
+    """
+    symbol = data.attrs.get('symbol')
+    if symbol is None:
+        return strategy.generate_signal(data, {})
+    
+    key = (strategy_key, symbol, data.index[-1])
+    signal = _signal_cache.get(key)
+    if signal is None:
+        signal = strategy.generate_signal(data, {})
+        _signal_cache[key] = signal
+    return signal
 
 
 def create_signal_generator(strategies: Dict, strategy_weights: Dict):
     """Create signal generator function for backtesting."""
+    logger = logging.getLogger(__name__)
+    
+    # Build strategy instances once per backtest rather than on every call
+    built_strategies = {}
+    strategy_keys = {}
+    for strategy_name, strategy_config in strategies.items():
+        if not strategy_config.get('enabled', True):
+            continue
+        
+        try:
+            if strategy_name == 'ema_crossover':
+                built_strategies[strategy_name] = EMACrossoverStrategy(
+                    short_period=strategy_config.get('short_period', 50),
+                    long_period=strategy_config.get('long_period', 200),
+                    approach_threshold=strategy_config.get('approach_threshold', 0.02)
+                )
+            elif strategy_name == 'supertrend':
+                built_strategies[strategy_name] = SuperTrendStrategy(
+                    atr_period=strategy_config.get('atr_period', 10),
+                    multiplier=strategy_config.get('multiplier', 3.0)
+                )
+            else:
+                continue
+            
+            # Parameter sweeps revisit the same strategy settings on the same data
+            strategy_keys[strategy_name] = (strategy_name, tuple(sorted(strategy_config.items())))
+        except Exception as e:
+            logger.debug(f"Strategy {strategy_name} could not be created: {e}")
+            continue
+    
+    scorer = MultiStrategyScorer(strategy_weights)
     
     def generate_signals(data: pd.DataFrame) -> Dict:
         """Generate trading signals for given data."""
         try:
-            # Generate legacy signal
-            legacy_signal, legacy_score = generate_legacy_signal(data)
+            # Legacy signal was scored for every bar up front by add_indicators
+            if 'Legacy_Signal' in data.columns:
+                legacy_signal = str(data['Legacy_Signal'].iloc[-1])
+                legacy_score = int(data['Legacy_Score'].iloc[-1])
+            else:
+                legacy_signal, legacy_score = generate_legacy_signal(data)
             
             # Generate strategy signals
             strategy_signals = []
             
-            for strategy_name, strategy_config in strategies.items():
-                if not strategy_config.get('enabled', True):
-                    continue
-                
+            for strategy_name, strategy in built_strategies.items():
                 try:
-                    if strategy_name == 'ema_crossover':
-                        strategy = EMACrossoverStrategy(
-                            short_period=strategy_config.get('short_period', 50),
-                            long_period=strategy_config.get('long_period', 200),
-                            approach_threshold=strategy_config.get('approach_threshold', 0.02)
-                        )
-                    elif strategy_name == 'supertrend':
-                        strategy = SuperTrendStrategy(
-                            atr_period=strategy_config.get('atr_period', 10),
-                            multiplier=strategy_config.get('multiplier', 3.0)
-                        )
-                    else:
-                        continue
-                    
-                    signal = strategy.generate_signal(data, {})
+                    signal = _cached_strategy_signal(strategy, strategy_keys[strategy_name], data)
                     strategy_signals.append(signal)
                     
                 except Exception as e:
-                    logging.getLogger(__name__).debug(f"Strategy {strategy_name} failed: {e}")
+                    logger.debug("Strategy %s failed: %s", strategy_name, e)
                     continue
             
             # Generate composite signal
             composite_signal = None
             if strategy_signals:
-                scorer = MultiStrategyScorer(strategy_weights)
                 composite_signal = scorer.calculate_composite_score(strategy_signals, "BACKTEST")
             
             return {
@@ -233,7 +624,7 @@ def create_signal_generator(strategies: Dict, strategy_weights: Dict):
             }
             
         except Exception as e:
-            logging.getLogger(__name__).debug(f"Error generating signals: {e}")
+            logger.debug("Error generating signals: %s", e)
             return {
                 'legacy_signal': 'NO_SIGNAL',
                 'legacy_score': 0,
@@ -246,8 +637,120 @@ def create_signal_generator(strategies: Dict, strategy_weights: Dict):
     return generate_signals
 
 
-def run_parameter_optimization(data_dict: Dict[str, pd.DataFrame], base_config: Dict) -> Dict:
-    """Run parameter optimization to find best strategy settings."""
+def _parameter_grid(param_ranges: Dict) -> List[Dict]:
+    """Expand nested parameter ranges into the full Cartesian grid of combinations."""
+    keys = [(section, name) for section, ranges in param_ranges.items() for name in ranges]
+    values = [param_ranges[section][name] for section, name in keys]
+    
+    grid = []
+    for combination in itertools.product(*values):
+        params = {}
+        for (section, name), value in zip(keys, combination):
+            params.setdefault(section, {})[name] = value
+        
+        # Skip EMA pairs where the short period is not actually shorter
+        ema = params.get('ema_crossover', {})
+        if ema.get('short_period', 0) >= ema.get('long_period', float('inf')):
+            continue
+        
+        grid.append(params)
+    
+    return grid
+
+
+def _apply_params(base_config: Dict, params: Dict) -> Dict:
+    """Return a copy of base_config with params merged into their config sections."""
+    # Only the strategies subtree is copied deeply; other sections are replaced
+    # rather than mutated, so they can be shared with base_config
+    test_config = dict(base_config)
+    test_config['strategies'] = copy.deepcopy(base_config['strategies'])
+    
+    for section, values in params.items():
+        if section in test_config['strategies']:
+            test_config['strategies'][section] = {**test_config['strategies'][section], **values}
+        else:
+            test_config[section] = {**test_config[section], **values}
+    
+    return test_config
+
+
+# Per-process state for optimizer workers, set once so data_dict is not
+# pickled again for every parameter combination
+_optimizer_data = {}
+_optimizer_config = {}
+_optimizer_cache = (None, None)
+_optimizer_engine = None
+
+
+def _init_optimizer_worker(data_dict: Dict[str, pd.DataFrame], base_config: Dict,
+                           max_age: int = None, dataset_key: bytes = None):
+    """Store the shared backtest inputs in an optimizer worker process."""
+    global _optimizer_data, _optimizer_config, _optimizer_cache
+    _optimizer_data = data_dict
+    _optimizer_config = base_config
+    _optimizer_cache = (max_age, dataset_key)
+    _signal_cache.clear()
+
+
+def _evaluate_params(params: Dict):
+    """Run one backtest for a parameter combination in an optimizer worker."""
+    logger = logging.getLogger(__name__)
+    
+    try:
+        test_config = _apply_params(_optimizer_config, params)
+        
+        strategy_weights = {}
+        if test_config['strategies']['ema_crossover']['enabled']:
+            strategy_weights['ema_crossover'] = test_config['strategies']['ema_crossover'].get('weight', 1.5)
+        if test_config['strategies']['supertrend']['enabled']:
+            strategy_weights['supertrend'] = test_config['strategies']['supertrend'].get('weight', 1.2)
+        
+        # Run backtest
+        signal_generator = create_signal_generator(test_config['strategies'], strategy_weights)
+        
+        backtest_config = BacktestConfig(
+            initial_capital=test_config['backtest']['initial_capital'],
+            position_size_percent=test_config['backtest']['position_size_percent'],
+            max_positions=test_config['backtest']['max_positions'],
+            stop_loss_percent=test_config['backtest']['stop_loss_percent'],
+            take_profit_percent=test_config['backtest']['take_profit_percent'],
+            min_composite_score=test_config['backtest']['min_composite_score']
+        )
+        
+        # Each worker reuses one engine across its combinations
+        global _optimizer_engine
+        if _optimizer_engine is None:
+            _optimizer_engine = BacktestEngine(backtest_config)
+        else:
+            _optimizer_engine.reset(backtest_config)
+        
+        max_age, dataset_key = _optimizer_cache
+        return _run_backtest_cached(
+            _optimizer_engine,
+            _optimizer_data, 
+            signal_generator,
+            test_config['strategies'],
+            test_config['data']['start_date'],
+            max_age=max_age,
+            dataset_key=dataset_key
+        )
+        
+    except Exception as e:
+        logger.error(f"Error testing parameters {params}: {e}")
+        return None
+
+
+def run_parameter_optimization(data_dict: Dict[str, pd.DataFrame], base_config: Dict,
+                               max_workers: int = None, cache: str = "none") -> Dict:
+    """Run parameter optimization to find best strategy settings.
+    
+    Every combination in the parameter grid is backtested independently, so
+    combinations are spread across a process pool.
+    
+    Args:
+        cache: Backtest result cache policy ('none', 'day', 'week' or 'month');
+            combinations already backtested on the same data are not re-run.
+    """
     logger = logging.getLogger(__name__)
     logger.info("Starting parameter optimization...")
     
@@ -273,63 +776,23 @@ def run_parameter_optimization(data_dict: Dict[str, pd.DataFrame], base_config:
     best_params = None
     best_return = -float('inf')
     
-    # Test different parameter combinations (simplified for demo)
-    test_combinations = [
-        # EMA periods
-        {'ema_crossover': {'short_period': 50, 'long_period': 200}, 'supertrend': {'atr_period': 10, 'multiplier': 3.0}},
-        {'ema_crossover': {'short_period': 20, 'long_period': 100}, 'supertrend': {'atr_period': 7, 'multiplier': 2.0}},
-        {'ema_crossover': {'short_period': 100, 'long_period': 300}, 'supertrend': {'atr_period': 14, 'multiplier': 4.0}},
-    ]
+    test_combinations = _parameter_grid(param_ranges)
+    logger.info(f"Testing {len(test_combinations)} parameter combinations")
+    
+    max_age = CACHE_MAX_AGE[cache]
+    dataset_key = _dataset_fingerprint(data_dict) if max_age is not None else None
     
-    for i, params in enumerate(test_combinations, 1):
-        logger.info(f"Testing parameter set {i}/{len(test_combinations)}: {params}")
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_optimizer_worker,
+                             initargs=(data_dict, base_config, max_age, dataset_key)) as executor:
+        # map keeps grid order so ties resolve to the earliest combination
+        results = executor.map(_evaluate_params, test_combinations, chunksize=4)
         
-        try:
-            # Update configuration
-            test_config = base_config.copy()
-            test_config['strategies'].update(params)
-            
-            # Create strategies
-            strategies = {}
-            strategy_weights = {}
-            
-            if test_config['strategies']['ema_crossover']['enabled']:
-                ema_config = test_config['strategies']['ema_crossover']
-                strategies['ema_crossover'] = EMACrossoverStrategy(
-                    short_period=ema_config.get('short_period', 50),
-                    long_period=ema_config.get('long_period', 200),
-                    approach_threshold=ema_config.get('approach_threshold', 0.02)
-                )
-                strategy_weights['ema_crossover'] = ema_config.get('weight', 1.5)
-            
-            if test_config['strategies']['supertrend']['enabled']:
-                st_config = test_config['strategies']['supertrend']
-                strategies['supertrend'] = SuperTrendStrategy(
-                    atr_period=st_config.get('atr_period', 10),
-                    multiplier=st_config.get('multiplier', 3.0)
-                )
-                strategy_weights['supertrend'] = st_config.get('weight', 1.2)
-            
-            # Run backtest
-            signal_generator = create_signal_generator(test_config['strategies'], strategy_weights)
-            
-            backtest_config = BacktestConfig(
-                initial_capital=test_config['backtest']['initial_capital'],
-                position_size_percent=test_config['backtest']['position_size_percent'],
-                max_positions=test_config['backtest']['max_positions'],
-                stop_loss_percent=test_config['backtest']['stop_loss_percent'],
-                take_profit_percent=test_config['backtest']['take_profit_percent'],
-                min_composite_score=test_config['backtest']['min_composite_score']
-            )
-            
-            engine = BacktestEngine(backtest_config)
-            result = engine.run_backtest(
-                data_dict, 
-                signal_generator,
-                test_config['data']['start_date']
-            )
+        for i, (params, result) in enumerate(zip(test_combinations, results), 1):
+            if result is None:
+                continue
             
-            logger.info(f"Result: {result.total_return_percent:.2f}% return, "
+            logger.info(f"Parameter set {i}/{len(test_combinations)} {params}: "
+                       f"{result.total_return_percent:.2f}% return, "
                        f"{result.win_rate:.1f}% win rate, {result.total_trades} trades")
             
             # Check if this is the best result
@@ -337,10 +800,6 @@ def run_parameter_optimization(data_dict: Dict[str, pd.DataFrame], base_config:
                 best_return = result.total_return_percent
                 best_result = result
                 best_params = params
-                
-        except Exception as e:
-            logger.error(f"Error testing parameters {params}: {e}")
-            continue
     
     logger.info(f"Best parameters found: {best_params}")
     logger.info(f"Best return: {best_return:.2f}%")
@@ -352,8 +811,13 @@ def run_parameter_optimization(data_dict: Dict[str, pd.DataFrame], base_config:
     }
 
 
-def generate_backtest_report(results, output_dir: str = "output/backtests"):
-    """Generate comprehensive backtest report."""
+def generate_backtest_report(results, output_dir: str = "output/backtests", make_charts: bool = True):
+    """Generate comprehensive backtest report.
+    
+    Args:
+        make_charts: Render the performance chart PNG; the JSON results and text
+            summary are always written.
+    """
     logger = logging.getLogger(__name__)
     
     output_path = Path(output_dir)
@@ -367,61 +831,60 @@ def generate_backtest_report(results, output_dir: str = "output/backtests"):
     # Generate performance charts
     chart_gen = ChartGenerator(output_path)
     
-    try:
-        # Equity curve chart
-        import matplotlib.pyplot as plt
-        
-        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
-        
-        # Equity curve
-        ax1.plot(results.equity_curve.index, results.equity_curve.values, 
-                linewidth=2, color='blue', label='Portfolio Value')
-        ax1.axhline(y=results.initial_capital, color='red', linestyle='--', 
-                   alpha=0.7, label='Initial Capital')
-        ax1.set_title("Equity Curve", fontsize=14, fontweight='bold')
-        ax1.set_ylabel("Portfolio Value (₹)")
-        ax1.legend()
-        ax1.grid(True, alpha=0.3)
-        
-        # Drawdown
-        peak = results.equity_curve.expanding().max()
-        drawdown = (results.equity_curve - peak) / peak * 100
-        ax2.fill_between(drawdown.index, drawdown.values, 0, 
-                        color='red', alpha=0.3, label='Drawdown')
-        ax2.set_title("Drawdown", fontsize=14, fontweight='bold')
-        ax2.set_ylabel("Drawdown (%)")
-        ax2.legend()
-        ax2.grid(True, alpha=0.3)
-        
-        # Monthly returns
-        monthly_returns = results.equity_curve.resample('M').last().pct_change().dropna() * 100
-        colors = ['green' if x > 0 else 'red' for x in monthly_returns]
-        ax3.bar(range(len(monthly_returns)), monthly_returns.values, color=colors, alpha=0.7)
-        ax3.set_title("Monthly Returns", fontsize=14, fontweight='bold')
-        ax3.set_ylabel("Return (%)")
-        ax3.axhline(y=0, color='black', linestyle='-', alpha=0.5)
-        ax3.grid(True, alpha=0.3)
-        
-        # Trade distribution
-        if results.trades:
-            trade_returns = [t.pnl_percent for t in results.trades]
-            ax4.hist(trade_returns, bins=20, alpha=0.7, color='skyblue', edgecolor='black')
-            ax4.axvline(x=0, color='red', linestyle='--', alpha=0.7)
-            ax4.set_title("Trade Return Distribution", fontsize=14, fontweight='bold')
-            ax4.set_xlabel("Return (%)")
-            ax4.set_ylabel("Frequency")
-            ax4.grid(True, alpha=0.3)
-        
-        plt.tight_layout()
-        
-        chart_file = output_path / f"backtest_performance_{timestamp}.png"
-        plt.savefig(chart_file, dpi=100, bbox_inches='tight')
-        plt.close()
-        
-        logger.info(f"Performance chart saved: {chart_file}")
-        
-    except Exception as e:
-        logger.error(f"Error generating performance charts: {e}")
+    if make_charts:
+        try:
+            # Equity curve chart
+            fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
+            
+            # Equity curve
+            ax1.plot(results.equity_curve.index, results.equity_curve.values, 
+                    linewidth=2, color='blue', label='Portfolio Value')
+            ax1.axhline(y=results.initial_capital, color='red', linestyle='--', 
+                       alpha=0.7, label='Initial Capital')
+            ax1.set_title("Equity Curve", fontsize=14, fontweight='bold')
+            ax1.set_ylabel("Portfolio Value (₹)")
+            ax1.legend()
+            ax1.grid(True, alpha=0.3)
+            
+            # Drawdown
+            peak = results.equity_curve.expanding().max()
+            drawdown = (results.equity_curve - peak) / peak * 100
+            ax2.fill_between(drawdown.index, drawdown.values, 0, 
+                            color='red', alpha=0.3, label='Drawdown')
+            ax2.set_title("Drawdown", fontsize=14, fontweight='bold')
+            ax2.set_ylabel("Drawdown (%)")
+            ax2.legend()
+            ax2.grid(True, alpha=0.3)
+            
+            # Monthly returns
+            monthly_returns = results.equity_curve.resample('M').last().pct_change().dropna() * 100
+            colors = ['green' if x > 0 else 'red' for x in monthly_returns]
+            ax3.bar(range(len(monthly_returns)), monthly_returns.values, color=colors, alpha=0.7)
+            ax3.set_title("Monthly Returns", fontsize=14, fontweight='bold')
+            ax3.set_ylabel("Return (%)")
+            ax3.axhline(y=0, color='black', linestyle='-', alpha=0.5)
+            ax3.grid(True, alpha=0.3)
+            
+            # Trade distribution
+            if results.trades:
+                trade_returns = [t.pnl_percent for t in results.trades]
+                ax4.hist(trade_returns, bins=20, alpha=0.7, color='skyblue', edgecolor='black')
+                ax4.axvline(x=0, color='red', linestyle='--', alpha=0.7)
+                ax4.set_title("Trade Return Distribution", fontsize=14, fontweight='bold')
+                ax4.set_xlabel("Return (%)")
+                ax4.set_ylabel("Frequency")
+                ax4.grid(True, alpha=0.3)
+            
+            plt.tight_layout()
+            
+            chart_file = output_path / f"backtest_performance_{timestamp}.png"
+            plt.savefig(chart_file, dpi=100, bbox_inches='tight')
+            plt.close()
+            
+            logger.info(f"Performance chart saved: {chart_file}")
+            
+        except Exception as e:
+            logger.error(f"Error generating performance charts: {e}")
     
     # Generate summary report
     report_file = output_path / f"backtest_summary_{timestamp}.txt"
@@ -456,14 +919,14 @@ def generate_backtest_report(results, output_dir: str = "output/backtests"):
         if results.trades:
             f.write("TOP 10 BEST TRADES\n")
             f.write("-" * 30 + "\n")
-            best_trades = sorted(results.trades, key=lambda x: x.pnl_percent, reverse=True)[:10]
+            best_trades = heapq.nlargest(10, results.trades, key=lambda x: x.pnl_percent)
             for i, trade in enumerate(best_trades, 1):
                 f.write(f"{i:2d}. {trade.symbol:12s} {trade.entry_date.strftime('%Y-%m-%d')} "
                        f"₹{trade.pnl:8.2f} ({trade.pnl_percent:6.2f}%) {trade.holding_days:3d} days\n")
             
             f.write("\nTOP 10 WORST TRADES\n")
             f.write("-" * 30 + "\n")
-            worst_trades = sorted(results.trades, key=lambda x: x.pnl_percent)[:10]
+            worst_trades = heapq.nsmallest(10, results.trades, key=lambda x: x.pnl_percent)
             for i, trade in enumerate(worst_trades, 1):
                 f.write(f"{i:2d}. {trade.symbol:12s} {trade.entry_date.strftime('%Y-%m-%d')} "
                        f"₹{trade.pnl:8.2f} ({trade.pnl_percent:6.2f}%) {trade.holding_days:3d} days\n")
@@ -485,6 +948,9 @@ def main():
     parser.add_argument("--start-date", type=str, default="2020-01-01", help="Start date (YYYY-MM-DD)")
     parser.add_argument("--end-date", type=str, help="End date (YYYY-MM-DD)")
     parser.add_argument("--optimize", action="store_true", help="Run parameter optimization")
+    parser.add_argument("--cache", choices=["none", "day", "week", "month"], default="day",
+                       help="Reuse downloaded price data and backtest results younger than this (default: day)")
+    parser.add_argument("--no-charts", action="store_true", help="Skip the performance chart in the report")
     parser.add_argument("--verbose", action="store_true", help="Verbose logging")
     parser.add_argument("--size", choices=["nifty50", "nifty100", "nifty500"], 
                        default="nifty50", help="NIFTY index size")
@@ -518,7 +984,8 @@ def main():
         symbols, 
         config['data']['start_date'], 
         config['data'].get('end_date'),
-        config['data']['min_data_threshold']
+        config['data']['min_data_threshold'],
+        cache=args.cache
     )
     
     if len(data_dict) < 3:
@@ -530,10 +997,10 @@ def main():
     # Run optimization if requested
     if args.optimize:
         logger.info("Running parameter optimization...")
-        optimization_results = run_parameter_optimization(data_dict, config)
+        optimization_results = run_parameter_optimization(data_dict, config, cache=args.cache)
         
         if optimization_results['best_params']:
-            config['strategies'].update(optimization_results['best_params'])
+            config = _apply_params(config, optimization_results['best_params'])
             logger.info(f"Using optimized parameters: {optimization_results['best_params']}")
     
     # Setup strategies
@@ -580,16 +1047,19 @@ def main():
     logger.info("Starting backtest...")
     engine = BacktestEngine(backtest_config)
     
-    results = engine.run_backtest(
+    results = _run_backtest_cached(
+        engine,
         data_dict, 
         signal_generator,
+        config['strategies'],
         config['data']['start_date'],
-        config['data'].get('end_date')
+        config['data'].get('end_date'),
+        max_age=CACHE_MAX_AGE[args.cache]
     )
     
     # Generate report
     logger.info("Generating backtest report...")
-    report_files = generate_backtest_report(results)
+    report_files = generate_backtest_report(results, make_charts=not args.no_charts)
     
     # Print summary
     print("\nBACKTEST RESULTS SUMMARY")
@@ -1,4 +1,4 @@
 @echo off
 echo Building Stock Trading Bot for Windows...
-python build_binary.py
+python build_enhanced_multi_strategy_binary.py
 pause
\ No newline at end of file
@@ -5,97 +5,270 @@ Build Enhanced Multi-Strategy Trading Bot Binary
 Creates a standalone executable with all new strategies included.
 """
 
-import PyInstaller.__main__
+import hashlib
+import importlib.util
 import sys
 import os
+import argparse
+import shutil
+from collections import defaultdict
 from pathlib import Path
 
-def build_binary():
-    """Build the enhanced multi-strategy trading bot binary."""
+APP_NAME = "enhanced-multi-strategy-nifty-bot"
+MAIN_SCRIPT = "enhanced_multi_strategy_bot.py"
+SPEC_FILE = Path(f"{APP_NAME}.spec")
+
+# Hash of requirements.txt at the last build, kept next to PyInstaller's cache
+REQUIREMENTS_HASH_FILE = Path("build") / "requirements.sha256"
+
+# Bot modules PyInstaller cannot discover on its own: src has no __init__.py,
+# so imports from it are listed explicitly. Third-party and standard library
+# modules imported by the bot are found by the dependency analysis.
+HIDDEN_IMPORTS = [
+    'src.strategies.ema_crossover_strategy',
+    'src.strategies.supertrend_strategy',
+    'src.strategies.multi_strategy_scorer',
+    'src.notifications.email_service',
+    'src.analysis.ema_calculator',
+    'src.analysis.supertrend_calculator',
+    'src.models.data_models',
+    'src.models.exceptions',
+    'src.interfaces.strategy',
+    'src.interfaces.indicator',
+    'src.utils._ewm',
+    'src.utils._njit',
+    'src.utils._rolling',
+]
+
+# Modules the bot never imports but PyInstaller's hooks would otherwise bundle.
+# matplotlib (and the PIL it depends on) stays in: the bot renders charts through
+# ChartGenerator on the Agg backend. seaborn only uses scipy when it is present.
+EXCLUDED_MODULES = [
+    'tkinter',
+    '_tkinter',
+    'IPython',
+    'jedi',
+    'notebook',
+    'sphinx',
+    'pytest',
+    'setuptools',
+    'test',
+    'pandas.tests',
+    'numpy.tests',
+    'scipy',
+    'PIL.ImageTk',
+    'PySide2',
+    'PySide6',
+    'PyQt5',
+]
+
+# Runtime DLLs that break when UPX-compressed
+UPX_EXCLUDES = ['vcruntime140.dll', 'python3*.dll']
+
+def create_spec_file(use_upx=True):
+    """
+    Write the PyInstaller spec file for the one-folder bot bundle.
+    
+    Returns:
+        Tuple of (spec file path, whether the spec content changed)
+    """
+    strip = sys.platform != "win32"
+    
+    spec_content = f'''# -*- mode: python ; coding: utf-8 -*-
+# Generated by build_enhanced_multi_strategy_binary.py - edit the builder instead
+
+a = Analysis(
+    [{MAIN_SCRIPT!r}],
+    pathex=[],
+    binaries=[],
+    datas=[('nifty500_symbols.py', '.'), ('input', 'input'), ('src', 'src')],
+    hiddenimports={HIDDEN_IMPORTS!r},
+    hookspath=[],
+    runtime_hooks=[],
+    excludes={EXCLUDED_MODULES!r},
+    noarchive=False,
+    optimize=2,
+)
+pyz = PYZ(a.pure)
+
+# Run the frozen interpreter at -OO so sys.flags.optimize matches the bytecode
+exe = EXE(
+    pyz,
+    a.scripts,
+    [('O', None, 'OPTION'), ('O', None, 'OPTION')],
+    exclude_binaries=True,
+    name={APP_NAME!r},
+    debug=False,
+    strip={strip!r},
+    upx={use_upx!r},
+    console=True,
+)
+
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip={strip!r},
+    upx={use_upx!r},
+    upx_exclude={UPX_EXCLUDES!r},
+    name={APP_NAME!r},
+)
+'''
+    
+    # Encode once: the same bytes are hashed and written, with no text-mode
+    # newline translation
+    spec_bytes = spec_content.encode('utf-8')
+    
+    # Leave an unchanged spec untouched so PyInstaller can reuse its build cache
+    new_hash = hashlib.sha256(spec_bytes).hexdigest()
+    if SPEC_FILE.exists() and hashlib.sha256(SPEC_FILE.read_bytes()).hexdigest() == new_hash:
+        return SPEC_FILE, False
+    
+    SPEC_FILE.write_bytes(spec_bytes)
+    
+    return SPEC_FILE, True
+
+def requirements_changed():
+    """
+    Check whether requirements.txt changed since the last successful build.
+    
+    Returns:
+        The new requirements hash, to be recorded with save_requirements_hash
+        once the build succeeds, or None if nothing changed
+    """
+    requirements = Path("requirements.txt")
+    if not requirements.exists():
+        return None
+    
+    current_hash = hashlib.sha256(requirements.read_bytes()).hexdigest()
+    if REQUIREMENTS_HASH_FILE.exists() and REQUIREMENTS_HASH_FILE.read_text().strip() == current_hash:
+        return None
+    return current_hash
+
+def save_requirements_hash(requirements_hash):
+    """Record the requirements hash a build succeeded with."""
+    REQUIREMENTS_HASH_FILE.parent.mkdir(parents=True, exist_ok=True)
+    REQUIREMENTS_HASH_FILE.write_text(requirements_hash)
+
+def find_missing_files(required_files):
+    """Return the required files that do not exist, listing each directory only once."""
+    by_dir = defaultdict(list)
+    for file_path in required_files:
+        path = Path(file_path)
+        by_dir[path.parent].append(file_path)
+    
+    missing_files = []
+    for directory, file_paths in by_dir.items():
+        try:
+            with os.scandir(directory) as entries:
+                present = {entry.name for entry in entries if entry.is_file()}
+        except FileNotFoundError:
+            present = set()
+        
+        missing_files.extend(p for p in file_paths if Path(p).name not in present)
+    
+    # Report in the order the files were listed
+    return sorted(missing_files, key=required_files.index)
+
+def check_sources():
+    """
+    Syntax-check the bot sources before the much longer PyInstaller run.
+    
+    Nothing is written to disk: PyInstaller compiles its own bytecode for the
+    bundle, and .pyc files under src/ would only be copied in as data.
+    """
+    ok = True
+    for path in sorted(Path('src').rglob('*.py')) + [Path(MAIN_SCRIPT), Path('nifty500_symbols.py')]:
+        try:
+            compile(path.read_bytes(), str(path), 'exec', dont_inherit=True)
+        except SyntaxError as e:
+            print(f"Syntax error in {path}: {e}")
+            ok = False
+    return ok
+
+def create_distribution_archive():
+    """Zip the one-folder bundle so it can be shipped as a single file."""
+    archive = shutil.make_archive(str(Path("dist") / APP_NAME), 'zip', root_dir="dist", base_dir=APP_NAME)
+    return Path(archive)
+
+def build_binary(use_upx=True, full_rebuild=False):
+    """Build the enhanced multi-strategy trading bot binary.
+    
+    The bot is built as a one-folder bundle from a generated spec file so
+    shared libraries are loaded in place instead of being extracted to a temp
+    directory on every launch. PyInstaller's build/ cache is reused unless a
+    full rebuild is requested or the spec or requirements changed.
+    """
     
     # Get the current directory
     current_dir = Path.cwd()
     
     # Define the main script
-    main_script = "enhanced_multi_strategy_bot.py"
+    main_script = MAIN_SCRIPT
     
     if not Path(main_script).exists():
         print(f"Error: {main_script} not found!")
         return False
     
-    # Define PyInstaller arguments
+    if not check_sources():
+        print("Error: the bot sources have syntax errors!")
+        return False
+    
+    spec_file, spec_changed = create_spec_file(use_upx)
+    
+    # Define PyInstaller arguments; everything else lives in the spec file
     args = [
-        main_script,
-        '--onefile',
-        '--name=enhanced-multi-strategy-nifty-bot',
+        str(spec_file),
         '--distpath=dist',
         '--workpath=build',
-        '--specpath=.',
-        '--clean',
         '--noconfirm',
-        
-        # Add data files
-        '--add-data=nifty500_symbols.py:.',
-        '--add-data=input:input',
-        
-        # Add source packages
-        '--add-data=src:src',
-        
-        # Hidden imports for strategies
-        '--hidden-import=src.strategies.ema_crossover_strategy',
-        '--hidden-import=src.strategies.supertrend_strategy', 
-        '--hidden-import=src.strategies.multi_strategy_scorer',
-        '--hidden-import=src.notifications.email_service',
-        '--hidden-import=src.analysis.ema_calculator',
-        '--hidden-import=src.analysis.supertrend_calculator',
-        '--hidden-import=src.models.data_models',
-        '--hidden-import=src.models.exceptions',
-        '--hidden-import=src.interfaces.strategy',
-        '--hidden-import=src.interfaces.indicator',
-        
-        # Standard hidden imports
-        '--hidden-import=yfinance',
-        '--hidden-import=pandas',
-        '--hidden-import=numpy',
-        '--hidden-import=yaml',
-        '--hidden-import=logging',
-        '--hidden-import=datetime',
-        '--hidden-import=pathlib',
-        '--hidden-import=argparse',
-        '--hidden-import=smtplib',
-        '--hidden-import=email.mime.text',
-        '--hidden-import=email.mime.multipart',
-        
-        # Console application
-        '--console',
-        
-        # Optimization
-        '--optimize=2',
     ]
     
+    # Reuse the build/ analysis cache unless something it depends on changed;
+    # new requirements may have installed packages that need a fresh scan. The
+    # new hash is only recorded after a successful build, so a failed one is
+    # cleaned again next time
+    new_requirements_hash = requirements_changed()
+    if full_rebuild or spec_changed or new_requirements_hash:
+        args.append('--clean')
+    
     print("Building Enhanced Multi-Strategy NIFTY Trading Bot Binary...")
     print("=" * 60)
     print(f"Main script: {main_script}")
+    print(f"Spec file: {spec_file}")
     print(f"Output directory: dist/")
     print(f"Build directory: build/")
     
     try:
+        # Imported here so --help and the pre-build checks don't pay for loading PyInstaller
+        import PyInstaller.__main__
+        
         # Run PyInstaller
-        PyInstaller.__main__.run(args)
+        print(f"PyInstaller version: {PyInstaller.__version__}")
+        try:
+            PyInstaller.__main__.run(args)
+        except SystemExit as e:
+            # PyInstaller runs in-process and reports build errors by exiting
+            if e.code:
+                print(f"\n❌ Build failed: PyInstaller exited with {e.code}")
+                return False
         
         # Check if binary was created successfully
-        binary_name = "enhanced-multi-strategy-nifty-bot"
+        binary_name = APP_NAME
         if sys.platform == "win32":
             binary_name += ".exe"
         
-        binary_path = Path("dist") / binary_name
+        binary_path = Path("dist") / APP_NAME / binary_name
         
         if binary_path.exists():
-            size_mb = binary_path.stat().st_size / (1024 * 1024)
+            size_mb = sum(f.stat().st_size for f in binary_path.parent.rglob('*') if f.is_file()) / (1024 * 1024)
             print(f"\n✅ Binary created successfully!")
             print(f"📁 Location: {binary_path}")
             print(f"📊 Size: {size_mb:.1f} MB")
             
+            if new_requirements_hash:
+                save_requirements_hash(new_requirements_hash)
+            
             # Test the binary
             print(f"\n🧪 Testing binary...")
             test_cmd = f'"{binary_path}" --help'
@@ -113,14 +286,17 @@ def build_binary():
 
 def main():
     """Main function."""
+    parser = argparse.ArgumentParser(description="Build the Enhanced Multi-Strategy NIFTY Trading Bot binary")
+    parser.add_argument("--noupx", action="store_true", help="Do not compress binaries with UPX")
+    parser.add_argument("--zip", action="store_true", help="Also package the bundle folder as a zip for distribution")
+    parser.add_argument("--full-rebuild", action="store_true", help="Discard PyInstaller's build cache and rebuild from scratch")
+    args = parser.parse_args()
+    
     print("Enhanced Multi-Strategy NIFTY Trading Bot Binary Builder")
     print("=" * 60)
     
-    # Check if PyInstaller is available
-    try:
-        import PyInstaller
-        print(f"PyInstaller version: {PyInstaller.__version__}")
-    except ImportError:
+    # Check if PyInstaller is available without importing it
+    if importlib.util.find_spec("PyInstaller") is None:
         print("❌ PyInstaller not found! Install with: pip install pyinstaller")
         return 1
     
@@ -137,10 +313,7 @@ def main():
         "src/notifications/email_service.py"
     ]
     
-    missing_files = []
-    for file_path in required_files:
-        if not Path(file_path).exists():
-            missing_files.append(file_path)
+    missing_files = find_missing_files(required_files)
     
     if missing_files:
         print("❌ Missing required files:")
@@ -151,12 +324,17 @@ def main():
     print("✅ All required files found")
     
     # Build the binary
-    if build_binary():
+    if build_binary(use_upx=not args.noupx, full_rebuild=args.full_rebuild):
         print("\n🎉 Build completed successfully!")
+        
+        if args.zip:
+            archive = create_distribution_archive()
+            print(f"📦 Distribution archive: {archive}")
+        
         print("\nUsage examples:")
-        print("  ./dist/enhanced-multi-strategy-nifty-bot --help")
-        print("  ./dist/enhanced-multi-strategy-nifty-bot --test")
-        print("  ./dist/enhanced-multi-strategy-nifty-bot --size nifty50")
+        print("  ./dist/enhanced-multi-strategy-nifty-bot/enhanced-multi-strategy-nifty-bot --help")
+        print("  ./dist/enhanced-multi-strategy-nifty-bot/enhanced-multi-strategy-nifty-bot --test")
+        print("  ./dist/enhanced-multi-strategy-nifty-bot/enhanced-multi-strategy-nifty-bot --size nifty50")
         return 0
     else:
         print("\n💥 Build failed!")
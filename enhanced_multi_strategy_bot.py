@@ -5,14 +5,24 @@ Enhanced Multi-Strategy NIFTY Trading Bot
 Advanced trading bot with EMA Crossover, SuperTrend, and Multi-Strategy scoring.
 """
 
+import copy
+import functools
+import hashlib
+import multiprocessing
+import os
+import pickle
+import sys
+import pytz
 import yfinance as yf
 import pandas as pd
 import numpy as np
 import logging
+import logging.handlers
 import yaml
-from datetime import datetime, time
+from datetime import datetime, time, timedelta
 from pathlib import Path
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from nifty500_symbols import get_symbol_list, validate_symbols
 
 # Import new strategies
@@ -21,6 +31,61 @@ from src.strategies.supertrend_strategy import SuperTrendStrategy
 from src.strategies.multi_strategy_scorer import MultiStrategyScorer
 from src.notifications.email_service import EmailNotificationService
 from src.visualization.chart_generator import ChartGenerator
+from src.utils._ewm import ewm_rsi, ewm_spans, ewm_state
+from src.utils._rolling import rolling_mean_std
+
+# TA-Lib is optional; indicator helpers fall back to pandas without it
+try:
+    import talib
+except ImportError:
+    talib = None
+
+# tqdm is optional; without it progress is printed every PROGRESS_INTERVAL symbols
+try:
+    from tqdm import tqdm
+except ImportError:
+    tqdm = None
+
+# Newer yfinance releases raise typed errors for symbols Yahoo does not know
+try:
+    from yfinance.exceptions import YFTickerMissingError, YFTzMissingError
+    TICKER_MISSING_ERRORS = (YFTickerMissingError, YFTzMissingError)
+except ImportError:
+    TICKER_MISSING_ERRORS = ()
+
+# Maximum number of tickers per yf.download request
+DOWNLOAD_BATCH_SIZE = 50
+
+# NSE trading session, in exchange-local time
+IST = pytz.timezone('Asia/Kolkata')
+MARKET_OPEN = time(9, 15)
+MARKET_CLOSE = time(15, 30)
+
+# Periods used by the legacy multi-indicator strategy
+LEGACY_RSI_PERIODS = [14, 21, 50]
+LEGACY_EMA_PERIODS = [9, 21, 50, 200]
+LEGACY_MACD_SPANS = [12, 26, 9]
+BOLLINGER_PERIOD = 20
+
+# Columns read by score_legacy_signal(s), in order
+LEGACY_COLS = ['RSI_14', 'RSI_21', 'RSI_50', 'EMA_9', 'EMA_21', 'EMA_50', 'EMA_200',
+               'Close', 'BB_Upper', 'BB_Lower', 'MACD', 'MACD_Signal']
+
+# Processes rendering charts alongside the analysis
+CHART_WORKERS = 2
+
+# Sources whose changes invalidate cached analysis results
+ANALYSIS_CODE_PATHS = [Path(__file__).parent / 'src', Path(__file__)]
+
+# Symbols between progress lines when tqdm is not installed
+PROGRESS_INTERVAL = 50
+
+# Symbols handed to each analysis worker at a time
+ANALYSIS_CHUNKSIZE = 8
+
+# Log records buffered before the log file is written; WARNING and above
+# are written immediately
+LOG_BUFFER_RECORDS = 256
 
 
 def setup_logging(verbose=False, output_config=None):
@@ -37,49 +102,131 @@ def setup_logging(verbose=False, output_config=None):
     else:
         log_file = 'enhanced_multi_strategy_bot.log'
     
+    log_format = '%(asctime)s - %(levelname)s - %(message)s'
+    file_handler = logging.FileHandler(log_file)
+    file_handler.setFormatter(logging.Formatter(log_format))
+    
     logging.basicConfig(
         level=level,
-        format='%(asctime)s - %(levelname)s - %(message)s',
+        format=log_format,
         handlers=[
             logging.StreamHandler(),
-            logging.FileHandler(log_file)
+            logging.handlers.MemoryHandler(LOG_BUFFER_RECORDS, flushLevel=logging.WARNING,
+                                           target=file_handler)
         ]
     )
     return logging.getLogger(__name__)
 
 
-def calculate_multiple_rsi(prices, periods=[14, 21, 50]):
-    """Calculate RSI for multiple periods."""
-    rsi_values = {}
+def flush_log_buffers():
+    """Write out buffered log records; worker processes exit without logging.shutdown."""
+    for handler in logging.getLogger().handlers:
+        handler.flush()
+
+
+def _drop_inherited_log_records():
+    """Forget records buffered by the parent so a forked child does not write them again."""
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, logging.handlers.MemoryHandler):
+            handler.buffer.clear()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_drop_inherited_log_records)
+
+
+def _like(prices, values):
+    """Wrap an array in a Series or DataFrame with the same labels as prices."""
+    if isinstance(prices, pd.DataFrame):
+        return pd.DataFrame(values, index=prices.index, columns=prices.columns)
+    return pd.Series(values, index=prices.index)
+
+
+def _rsi_values(values, periods, state=None, prev=None):
+    """
+    RSI of a 1-D or (dates x symbols) array, stacked as (len(periods),) + values.shape.
     
-    for period in periods:
-        delta = prices.diff()
-        gains = delta.where(delta > 0, 0)
-        losses = -delta.where(delta < 0, 0)
-        
-        avg_gains = gains.ewm(span=period).mean()
-        avg_losses = losses.ewm(span=period).mean()
-        
+    state is an optional (gains, losses) pair of EWM states to resume from,
+    and prev the close before values[0] when resuming.
+    """
+    return ewm_rsi(values, periods, state, prev)
+
+
+def _rsi_from_averages(avg_gains, avg_losses):
+    """RSI from average gains and losses, with 50 where it is undefined."""
+    with np.errstate(divide='ignore', invalid='ignore'):
         rs = avg_gains / avg_losses
         rsi = 100 - (100 / (1 + rs))
-        
-        rsi_values[f'RSI_{period}'] = rsi.fillna(50)
+    rsi[np.isnan(rsi)] = 50
+    
+    return rsi
+
+
+def _trend_values(values, ema_periods, fast, slow, signal, state=None):
+    """
+    EMAs stacked as (len(ema_periods),) + values.shape, plus the MACD line, signal and histogram.
+    
+    state is an optional (EMAs incl. fast/slow, signal) pair of EWM states to resume from.
+    """
+    ema_state, signal_state = state if state is not None else (None, None)
+    emas = ewm_spans(values, list(ema_periods) + [fast, slow], ema_state)
+    
+    macd_line = emas[-2] - emas[-1]
+    signal_line = ewm_spans(macd_line, [signal], signal_state)[0]
+    histogram = macd_line - signal_line
+    
+    return emas[:len(ema_periods)], macd_line, signal_line, histogram
+
+
+def calculate_multiple_rsi(prices, periods=[14, 21, 50]):
+    """Calculate RSI for multiple periods."""
+    rsi = _rsi_values(prices.to_numpy(dtype=np.float64), periods)
     
-    return rsi_values
+    return {f'RSI_{period}': _like(prices, rsi[i]) for i, period in enumerate(periods)}
 
 
 def calculate_multiple_ema(prices, periods=[9, 21, 50, 200]):
     """Calculate EMA for multiple periods."""
-    ema_values = {}
+    emas = ewm_spans(prices.to_numpy(dtype=np.float64), periods)
+    
+    return {f'EMA_{period}': _like(prices, emas[i]) for i, period in enumerate(periods)}
+
+
+def calculate_trend_indicators(prices, ema_periods=[9, 21, 50, 200], fast=12, slow=26, signal=9):
+    """
+    Calculate the EMAs and MACD together.
     
-    for period in periods:
-        ema_values[f'EMA_{period}'] = prices.ewm(span=period).mean()
+    All EMA streams, including MACD's fast and slow lines, come from a single
+    pass over the prices; only the signal line needs a second pass over MACD.
     
-    return ema_values
+    Returns:
+        Tuple of (EMA dict, (macd_line, signal_line, histogram))
+    """
+    emas, *macd = _trend_values(prices.to_numpy(dtype=np.float64), ema_periods, fast, slow, signal)
+    
+    ema_values = {f'EMA_{period}': _like(prices, emas[i]) for i, period in enumerate(ema_periods)}
+    
+    return ema_values, tuple(_like(prices, line) for line in macd)
+
+
+def _bollinger_values(values, period=20, std_dev=2):
+    """Bollinger Bands (upper, middle, lower) of a 1-D or (dates x symbols) array; period must be > 1."""
+    if talib is not None and values.ndim == 1 and not np.isnan(values).any():
+        sma = talib.SMA(values, timeperiod=period)
+        # TA-Lib STDDEV is the population deviation; rescale to the sample std pandas uses
+        std = talib.STDDEV(values, timeperiod=period, nbdev=1) * np.sqrt(period / (period - 1))
+    else:
+        sma, std = rolling_mean_std(values, period)
+    
+    return sma + (std * std_dev), sma, sma - (std * std_dev)
 
 
 def calculate_bollinger_bands(prices, period=20, std_dev=2):
     """Calculate Bollinger Bands."""
+    if period > 1:
+        return tuple(_like(prices, band) for band in
+                     _bollinger_values(prices.to_numpy(dtype=np.float64), period, std_dev))
+    
     sma = prices.rolling(window=period).mean()
     std = prices.rolling(window=period).std()
     
@@ -91,14 +238,149 @@ def calculate_bollinger_bands(prices, period=20, std_dev=2):
 
 def calculate_macd(prices, fast=12, slow=26, signal=9):
     """Calculate MACD indicator."""
-    ema_fast = prices.ewm(span=fast).mean()
-    ema_slow = prices.ewm(span=slow).mean()
+    _, macd = calculate_trend_indicators(prices, [], fast, slow, signal)
+    return macd
+
+
+def calculate_legacy_indicators(prices):
+    """
+    Calculate every indicator column the legacy strategy uses.
     
-    macd_line = ema_fast - ema_slow
-    signal_line = macd_line.ewm(span=signal).mean()
-    histogram = macd_line - signal_line
+    Everything stays in NumPy: the result maps column names to arrays aligned
+    with prices, so charts can build a frame from it in one go. The kernels
+    accumulate in float64, but the columns are float32 like the backtest's
+    add_indicators, so live signals are scored on the same values that were
+    backtested.
+    """
+    values = prices.to_numpy(dtype=np.float64)
+    indicators = {}
+    
+    for period, rsi in zip(LEGACY_RSI_PERIODS, _rsi_values(values, LEGACY_RSI_PERIODS)):
+        indicators[f'RSI_{period}'] = rsi
+    
+    emas, macd_line, signal_line, histogram = _trend_values(values, LEGACY_EMA_PERIODS, *LEGACY_MACD_SPANS)
+    for period, ema in zip(LEGACY_EMA_PERIODS, emas):
+        indicators[f'EMA_{period}'] = ema
+    
+    indicators['BB_Upper'], indicators['BB_Middle'], indicators['BB_Lower'] = _bollinger_values(values)
+    indicators['MACD'], indicators['MACD_Signal'], indicators['MACD_Histogram'] = macd_line, signal_line, histogram
     
-    return macd_line, signal_line, histogram
+    return {name: column.astype(np.float32) for name, column in indicators.items()}
+
+
+def build_feature_bundle(data, strategies):
+    """
+    Precompute the EMA and ATR series the configured strategies need.
+    
+    All EMA spans go through the EWM kernel in one pass, so each series is
+    computed once per symbol rather than inside every strategy.
+    
+    Returns:
+        Indicators dict of 'ema_<period>' / 'atr_<period>' series for generate_signal
+    """
+    strategies = list(strategies.values())
+    ema_periods = sorted({period for strategy in strategies
+                          for period in (getattr(strategy, 'short_period', None), getattr(strategy, 'long_period', None))
+                          if period})
+    atr_periods = sorted({strategy.atr_period for strategy in strategies if hasattr(strategy, 'atr_period')})
+    
+    features = {}
+    close = data['Close'].to_numpy(dtype=np.float64)
+    
+    if ema_periods:
+        for period, ema in zip(ema_periods, ewm_spans(close, ema_periods)):
+            features[f'ema_{period}'] = pd.Series(ema, index=data.index)
+    
+    if atr_periods:
+        high = data['High'].to_numpy(dtype=np.float64)
+        low = data['Low'].to_numpy(dtype=np.float64)
+        prev_close = np.concatenate(([np.nan], close[:-1]))
+        true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+        for period, atr in zip(atr_periods, ewm_spans(true_range, atr_periods)):
+            features[f'atr_{period}'] = pd.Series(atr, index=data.index)
+    
+    return features
+
+
+def _copyewm_state(state):
+    """Copy the EWM (weighted, old_wt) arrays of a legacy indicator state."""
+    return {key: tuple(part.copy() for part in state[key]) for key in ('gains', 'losses', 'emas', 'signal')}
+
+
+def latest_legacy_values(prices, state=None, final_bars=None):
+    """
+    Latest legacy indicator values, resuming the EWM recurrences from a saved state.
+    
+    When the state's bar is still in prices with the same close, only the
+    bars after it are processed; otherwise (first run, or history revised by
+    a split or dividend adjustment) everything is recomputed. Bollinger Bands
+    only need the last window of closes.
+    
+    Args:
+        prices: Close series
+        state: State returned by a previous call for the same symbol, or None
+        final_bars: Number of leading bars that are final; bars after them
+            (a session still trading) count towards the values but are kept
+            out of the returned state. Defaults to all bars.
+        
+    Returns:
+        Tuple of (dict of latest values by column name, new state or None)
+    """
+    values = prices.to_numpy(dtype=np.float64)
+    n = len(values)
+    final_bars = n if final_bars is None else final_bars
+    
+    start = 0
+    if state is not None:
+        pos = prices.index.get_indexer([state['bar']])[0]
+        if 0 <= pos < final_bars and values[pos] == state['close']:
+            start = pos + 1
+            state = _copyewm_state(state)
+        else:
+            state = None
+    
+    if state is None:
+        state = {
+            'gains': ewm_state(LEGACY_RSI_PERIODS),
+            'losses': ewm_state(LEGACY_RSI_PERIODS),
+            'emas': ewm_state(LEGACY_EMA_PERIODS + LEGACY_MACD_SPANS[:2]),
+            'signal': ewm_state(LEGACY_MACD_SPANS[2:]),
+        }
+    
+    new_state = None
+    for segment_start, segment_end in ((start, final_bars), (max(start, final_bars), n)):
+        if segment_end > segment_start:
+            segment = values[segment_start:segment_end]
+            prev = values[segment_start - 1:segment_start] if segment_start else None
+            _rsi_values(segment, LEGACY_RSI_PERIODS, (state['gains'], state['losses']), prev)
+            _trend_values(segment, LEGACY_EMA_PERIODS, *LEGACY_MACD_SPANS, (state['emas'], state['signal']))
+        
+        if segment_end == final_bars and final_bars > 0 and new_state is None:
+            new_state = _copyewm_state(state)
+            new_state['bar'] = prices.index[final_bars - 1]
+            new_state['close'] = values[final_bars - 1]
+    
+    # The running means are the indicator values at the last processed bar
+    latest = {}
+    rsi = _rsi_from_averages(state['gains'][0][:, 0], state['losses'][0][:, 0])
+    for period, value in zip(LEGACY_RSI_PERIODS, rsi):
+        latest[f'RSI_{period}'] = value
+    
+    emas = state['emas'][0][:, 0]
+    for period, value in zip(LEGACY_EMA_PERIODS, emas):
+        latest[f'EMA_{period}'] = value
+    
+    upper, middle, lower = _bollinger_values(values[-BOLLINGER_PERIOD:], BOLLINGER_PERIOD)
+    latest['BB_Upper'], latest['BB_Middle'], latest['BB_Lower'] = upper[-1], middle[-1], lower[-1]
+    
+    latest['MACD'] = emas[-2] - emas[-1]
+    latest['MACD_Signal'] = state['signal'][0][0, 0]
+    latest['MACD_Histogram'] = latest['MACD'] - latest['MACD_Signal']
+    
+    # Same float32 rounding as calculate_legacy_indicators
+    latest = {name: np.float64(np.float32(value)) for name, value in latest.items()}
+    
+    return latest, new_state
 
 
 def generate_legacy_signal(data):
@@ -111,8 +393,18 @@ def generate_legacy_signal(data):
     - Bollinger Bands for volatility
     - MACD for momentum
     """
-    latest = data.iloc[-1]
+    # Slice the last row before selecting columns so only one row is copied
+    latest = data.iloc[-1:][LEGACY_COLS].to_numpy(dtype=np.float64)[0]
+    return score_legacy_signal(dict(zip(LEGACY_COLS, latest)))
+
+
+def score_legacy_signal(latest):
+    """
+    Score the legacy strategy from the latest Close and indicator values.
     
+    Plain scalar comparisons keep a single row cheap; use score_legacy_signals
+    to score many rows at once.
+    """
     # RSI Analysis
     rsi_14 = latest['RSI_14']
     rsi_21 = latest['RSI_21']
@@ -191,65 +483,545 @@ def generate_legacy_signal(data):
         return 'NO_SIGNAL', max(buy_score, sell_score)
 
 
+
+def score_legacy_signals(values):
+    """
+    Score the legacy strategy for many rows at once.
+    
+    values is an (N, len(LEGACY_COLS)) array or a frame with the LEGACY_COLS
+    columns. Every rule is a boolean mask over all rows, so scoring a whole
+    index takes a handful of array operations instead of a Python branch
+    cascade per symbol. Returns (signal labels, scores) arrays of length N.
+    
+    Each rule reads whole features, so they are laid out column-major: a
+    frame's float block already is, and a row-major array is copied once.
+    """
+    if isinstance(values, pd.DataFrame):
+        values = values[LEGACY_COLS].to_numpy(dtype=np.float64)
+    (rsi_14, rsi_21, rsi_50, ema_9, ema_21, ema_50, ema_200,
+     price, bb_upper, bb_lower, macd, macd_signal) = np.asfortranarray(values, dtype=np.float64).T
+    
+    # RSI Scoring (Multiple timeframes)
+    buy_score = 3 * (rsi_14 < 30) + ((rsi_14 >= 30) & (rsi_14 < 40))
+    sell_score = 3 * (rsi_14 > 70) + ((rsi_14 > 60) & (rsi_14 <= 70))
+    buy_score += 2 * (rsi_21 < 35)
+    sell_score += 2 * (rsi_21 > 65)
+    buy_score += rsi_50 < 40
+    sell_score += rsi_50 > 60
+    
+    # EMA Trend Analysis
+    buy_score += 3 * ((price > ema_9) & (ema_9 > ema_21) & (ema_21 > ema_50))
+    sell_score += 3 * ((price < ema_9) & (ema_9 < ema_21) & (ema_21 < ema_50))
+    buy_score += 2 * (price > ema_200)
+    sell_score += 2 * (price < ema_200)
+    
+    # Bollinger Bands
+    below_band = price < bb_lower
+    buy_score += 2 * below_band
+    sell_score += 2 * ((price > bb_upper) & ~below_band)
+    
+    # MACD Momentum
+    buy_score += 2 * ((macd > macd_signal) & (macd > 0))
+    sell_score += 2 * ((macd < macd_signal) & (macd < 0))
+    
+    # Generate signal based on scores
+    buy_wins = buy_score > sell_score
+    sell_wins = sell_score > buy_score
+    signals = np.select(
+        [(buy_score >= 6) & buy_wins, (buy_score >= 4) & buy_wins,
+         (sell_score >= 6) & sell_wins, (sell_score >= 4) & sell_wins],
+        ['STRONG_BUY', 'BUY', 'STRONG_SELL', 'SELL'], default='NO_SIGNAL')
+    
+    return signals, np.maximum(buy_score, sell_score)
+
+
+def ist_now():
+    """Current wall-clock time in IST, as a naive datetime."""
+    return datetime.now(IST).replace(tzinfo=None)
+
+
 def is_market_hours():
     """Check if Indian market is open (9:15 AM to 3:30 PM IST)."""
-    now = datetime.now()
-    
+    # Called for every symbol, so the answer is reused within the same minute
+    return _market_hours_at(ist_now().replace(second=0, microsecond=0))
+
+
+@functools.lru_cache(maxsize=1)
+def _market_hours_at(now):
+    """Market-hours check for one (minute-truncated) IST moment."""
     # Check if it's a weekday (Monday = 0, Sunday = 6)
     if now.weekday() >= 5:  # Saturday or Sunday
         return False
     
-    # Indian market hours: 9:15 AM to 3:30 PM IST
-    market_open = time(9, 15)
-    market_close = time(15, 30)
-    current_time = now.time()
+    return MARKET_OPEN <= now.time() <= MARKET_CLOSE
+
+
+def last_market_close(now=None):
+    """Get the most recent Indian market close (3:30 PM IST on a weekday), as naive IST."""
+    now = now or ist_now()
+    close = datetime.combine(now.date(), MARKET_CLOSE)
+    
+    if now < close:
+        close -= timedelta(days=1)
+    while close.weekday() >= 5:  # Saturday or Sunday
+        close -= timedelta(days=1)
+    
+    return close
+
+
+def get_fetch_settings(config=None):
+    """Get (periods to try in order, minimum records) from the data fetching config."""
+    if config and 'data_fetching' in config:
+        data_config = config['data_fetching']
+        max_period = data_config.get('max_data_period', 'max')
+        fallback_periods = data_config.get('fallback_periods', ["max", "10y", "5y", "2y", "1y", "6mo"])
+        min_threshold = data_config.get('min_data_threshold', 200)
+    else:
+        # Default configuration prioritizing maximum data
+        max_period = "max"
+        fallback_periods = ["max", "10y", "5y", "2y", "1y", "6mo"]
+        min_threshold = 200
+    
+    # Try different periods to get maximum data, starting with "max"
+    periods_to_try = fallback_periods if max_period == "max" else [max_period] + [p for p in fallback_periods if p != max_period]
+    return periods_to_try, min_threshold
+
+
+@functools.lru_cache(maxsize=600)
+def get_ticker(symbol):
+    """Get a yfinance Ticker, reusing one object per symbol for the session."""
+    return yf.Ticker(symbol)
+
+
+def period_length(period):
+    """Approximate length of a yfinance period string in days ('max' is infinite)."""
+    if period == 'max':
+        return float('inf')
+    if period == 'ytd':
+        return datetime.now().timetuple().tm_yday
+    for suffix, days in (('mo', 30), ('wk', 7), ('y', 365), ('d', 1)):
+        if period.endswith(suffix) and period[:-len(suffix)].isdigit():
+            return int(period[:-len(suffix)]) * days
+    return 0
+
+
+def fetch_symbol_history(symbol, logger, periods_to_try, min_threshold):
+    """
+    Fetch one symbol's history, falling back through the other periods.
+    
+    Once a period returns a frame that is too short, periods no longer than
+    it are skipped: they can only return a subset of the same bars.
+    """
+    ticker = get_ticker(symbol)
+    data = None
+    too_short = None
+    
+    for period in periods_to_try:
+        if too_short is not None and period_length(period) <= too_short:
+            continue
+        try:
+            logger.debug("Attempting to fetch %s data for %s...", period, symbol)
+            data = ticker.history(period=period)
+            if not data.empty and len(data) >= min_threshold:
+                logger.debug("Successfully fetched %d days of data for %s (period: %s)", len(data), symbol, period)
+                return data, period
+            else:
+                logger.debug("Insufficient data with %s period for %s: %d days", period, symbol, len(data))
+                if not data.empty:
+                    too_short = period_length(period)
+        except TICKER_MISSING_ERRORS as e:
+            # Shorter periods cannot help when Yahoo does not know the symbol
+            logger.debug("Skipping remaining periods for %s: %s", symbol, e)
+            break
+        except Exception as e:
+            logger.debug("Failed to fetch %s data for %s: %s", period, symbol, e)
+            continue
+    
+    return data, None
+
+
+def get_cache_dir(config=None):
+    """Get the cache directory under the configured output base directory."""
+    output_config = (config or {}).get('output') or {}
+    return Path(output_config.get('base_directory', 'output')) / 'cache'
+
+
+def config_hash(config=None):
+    """Short hash of a configuration, used to invalidate cached signals."""
+    return hashlib.sha1(yaml.safe_dump(config or {}, sort_keys=True).encode()).hexdigest()[:8]
+
+
+def hash_sources(paths):
+    """Hash every .py file under paths, keyed by its path relative to each root's parent."""
+    digest = hashlib.blake2b(digest_size=16)
+    for root in paths:
+        for path in sorted(root.rglob('*.py')) if root.is_dir() else [root]:
+            if path.is_file():
+                digest.update(path.relative_to(root.parent).as_posix().encode())
+                digest.update(path.read_bytes())
+    return digest.digest()
+
+
+@functools.lru_cache(maxsize=None)
+def code_hash():
+    """Short hash of the bot's sources, so an upgrade invalidates cached signals."""
+    return hash_sources(ANALYSIS_CODE_PATHS).hex()[:8]
+
+
+def data_hash(data):
+    """Short hash of a symbol's dates and OHLCV values, so revised history invalidates cached signals."""
+    digest = hashlib.blake2b(digest_size=4)
+    digest.update(data.index.asi8.tobytes())
+    for column in ('Open', 'High', 'Low', 'Close', 'Volume'):
+        if column in data.columns:
+            digest.update(data[column].to_numpy(dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+def signal_cache_path(symbol, data, config=None):
+    """Path of the cached analysis result for a symbol's history, config and code."""
+    bar_date = data.index[-1].date()
+    return (get_cache_dir(config) / 'signals' /
+            f"{symbol}_{bar_date:%Y%m%d}_{config_hash(config)}{code_hash()}_{data_hash(data)}.pkl")
+
+
+def load_cached_signal(symbol, data, config=None):
+    """
+    Load the cached analysis of a symbol's history.
+    
+    Results are only reused outside market hours; intraday the last bar is
+    still forming, so it must be analyzed again. The timestamp is refreshed
+    so reports show when the result was served.
+    
+    Returns:
+        (result, composite_signal), or None on a miss
+    """
+    if is_market_hours():
+        return None
+    
+    try:
+        with open(signal_cache_path(symbol, data, config), 'rb') as f:
+            result, composite_signal = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+        return None
     
-    return market_open <= current_time <= market_close
+    return dict(result, timestamp=datetime.now()), composite_signal
+
+
+def save_cached_signal(result, data, config=None, composite_signal=None):
+    """
+    Cache an analysis result and its composite signal once the last bar is final.
+    
+    Entries for the same or older bars under the same config and code are
+    removed; entries for other configs are kept so alternating between
+    configs still hits.
+    """
+    if is_market_hours():
+        return
+    
+    symbol = result['symbol']
+    path = signal_cache_path(symbol, data, config)
+    key = f"{config_hash(config)}{code_hash()}"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    for stale in path.parent.glob(f"{symbol}_*_{key}_*.pkl"):
+        if stale != path and stale.name[len(symbol) + 1:].split('_')[0] <= f"{data.index[-1]:%Y%m%d}":
+            stale.unlink(missing_ok=True)
+    
+    with open(path, 'wb') as f:
+        pickle.dump((result, composite_signal), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def ema_state_path(symbol, config=None):
+    """Path of a symbol's saved legacy indicator state."""
+    return get_cache_dir(config) / 'ema_state' / f"{symbol}.pkl"
+
+
+def load_ema_state(symbol, config=None):
+    """
+    Load the legacy indicator state saved by latest_legacy_values.
+    
+    Returns:
+        State dict, or None if there is none yet
+    """
+    try:
+        with open(ema_state_path(symbol, config), 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+
+
+def save_ema_state(symbol, state, config=None):
+    """Save a symbol's legacy indicator state; one file per symbol so workers never share one."""
+    if state is None:
+        return
+    
+    path = ema_state_path(symbol, config)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'wb') as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _batch_frame(raw, symbol, batch):
+    """Pull one symbol's frame out of a yf.download result for batch, or None if missing."""
+    if isinstance(raw.columns, pd.MultiIndex):
+        if symbol not in raw.columns.get_level_values(0):
+            return None
+        return raw[symbol].dropna(how='all')
+    # Older yfinance versions return flat columns for a single ticker; for
+    # several tickers the frame can't be attributed, so they fall back one by one
+    if len(batch) != 1:
+        return None
+    return raw.dropna(how='all')
+
+
+def _extend_cached(cached, new):
+    """
+    Append newly downloaded bars to a cached frame.
+    
+    The download starts at the cached last bar so that bar can be compared:
+    prices are adjusted, and a split or dividend since the cache was written
+    rescales the whole history, in which case None is returned and the
+    symbol is downloaded in full.
+    """
+    last = cached.index[-1]
+    if new is None or new.empty or last not in new.index:
+        return None
+    if not np.isclose(new.at[last, 'Close'], cached['Close'].iloc[-1], rtol=1e-4):
+        return None
+    
+    # The cached last bar may have been written mid-session, so take the new one
+    return pd.concat([cached.iloc[:-1], new.loc[last:]])
+
+
+def fetch_all(symbols, logger, config=None):
+    """
+    Fetch history for all symbols with batched yf.download calls.
+    
+    Frames are cached as parquet under <output base>/cache. Outside market hours
+    a cached frame written after the last market close is reused instead of
+    downloading it again. Older cached frames are extended with only the bars
+    since their last date. Symbols missing from the batch download, or short of
+    the minimum record count, fall back to the per-symbol period ladder.
+    
+    Returns:
+        Dict of symbol -> (data, period_used)
+    """
+    periods_to_try, min_threshold = get_fetch_settings(config)
+    cache_dir = get_cache_dir(config)
+    
+    fetched = {}
+    stale = {}
+    to_download = []
+    
+    # Intraday data keeps changing, so the cache is only trusted after the close
+    cache_valid_after = None if is_market_hours() else IST.localize(last_market_close()).timestamp()
+    
+    for symbol in symbols:
+        cache_path = cache_dir / f"{symbol}.parquet"
+        if cache_path.exists():
+            try:
+                cached = pd.read_parquet(cache_path)
+                if cache_valid_after is not None and cache_path.stat().st_mtime >= cache_valid_after:
+                    fetched[symbol] = (cached, 'cached')
+                    continue
+                if not cached.empty:
+                    stale[symbol] = cached
+                    continue
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable cache file {cache_path}: {e}")
+        to_download.append(symbol)
+    
+    if fetched:
+        logger.info(f"Loaded {len(fetched)} symbols from cache")
+    
+    downloaded = {}
+    
+    # Stale frames only need the bars since their last date; group them by that
+    # date so each group is still one batched request
+    by_start = {}
+    for symbol, cached in stale.items():
+        by_start.setdefault(cached.index[-1].date(), []).append(symbol)
+    
+    for start, group in by_start.items():
+        for i in range(0, len(group), DOWNLOAD_BATCH_SIZE):
+            batch = group[i:i + DOWNLOAD_BATCH_SIZE]
+            try:
+                logger.info(f"Updating {len(batch)} cached symbols from {start}...")
+                raw = yf.download(batch, start=start, group_by='ticker',
+                                  threads=True, auto_adjust=True, progress=False)
+            except Exception as e:
+                logger.error(f"Error updating cached symbols from {start}: {e}")
+                raw = pd.DataFrame()
+            
+            for symbol in batch:
+                data = _extend_cached(stale[symbol], _batch_frame(raw, symbol, batch) if not raw.empty else None)
+                if data is not None and len(data) >= min_threshold:
+                    downloaded[symbol] = (data, 'incremental')
+                else:
+                    to_download.append(symbol)
+    
+    batches = [to_download[i:i + DOWNLOAD_BATCH_SIZE] for i in range(0, len(to_download), DOWNLOAD_BATCH_SIZE)]
+    
+    # Symbols the batch returned too little history for only need the periods
+    # longer than the batch period; with 'max' first there are none to try
+    longer_periods = [p for p in periods_to_try if period_length(p) > period_length(periods_to_try[0])]
+    short = set()
+    
+    for batch_num, batch in enumerate(batches, 1):
+        try:
+            logger.info(f"Downloading batch {batch_num}/{len(batches)} ({len(batch)} symbols)...")
+            raw = yf.download(batch, period=periods_to_try[0], group_by='ticker',
+                              threads=True, auto_adjust=True, progress=False)
+        except Exception as e:
+            logger.error(f"Error downloading batch {batch_num}: {e}")
+            continue
+        
+        for symbol in batch:
+            data = _batch_frame(raw, symbol, batch)
+            if data is not None and len(data) >= min_threshold:
+                downloaded[symbol] = (data, periods_to_try[0])
+            elif data is not None and not data.empty:
+                short.add(symbol)
+    
+    # Walk the fallback ladder only for symbols the batch could not cover
+    for symbol in to_download:
+        if symbol not in downloaded:
+            periods = longer_periods if symbol in short else periods_to_try
+            if not periods:
+                logger.warning(f"{symbol}: insufficient history for analysis, skipping")
+                continue
+            data, period_used = fetch_symbol_history(symbol, logger, periods, min_threshold)
+            if data is not None and not data.empty and len(data) >= min_threshold:
+                # Ticker.history dates are exchange-local midnights; drop the zone so
+                # the cache lines up with the tz-naive yf.download frames that extend it
+                if data.index.tz is not None:
+                    data = data.tz_localize(None)
+                downloaded[symbol] = (data, period_used)
+    
+    if downloaded:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        for symbol, (data, _) in downloaded.items():
+            try:
+                data.to_parquet(cache_dir / f"{symbol}.parquet", compression='zstd')
+            except Exception as e:
+                logger.warning(f"Failed to cache data for {symbol}: {e}")
+    
+    fetched.update(downloaded)
+    return fetched
+
+
+def build_chart_payload(symbol, data, composite_signal, legacy_signal, legacy_score,
+                        strategy_summary, indicators=None):
+    """
+    Collect everything needed to draw a symbol's chart.
+    
+    Legacy indicators are recalculated from data when they are not passed in.
+    
+    Returns:
+        Payload dict for render_chart, or None if the signal is too weak to chart
+    """
+    if not composite_signal or abs(composite_signal.composite_score) < 30.0:
+        return None
+    
+    if indicators is None:
+        indicators = calculate_legacy_indicators(data['Close'])
+    
+    return {
+        'symbol': symbol,
+        # Attach all indicator columns in one concat rather than one insert per column
+        'data': pd.concat([data, pd.DataFrame(indicators, index=data.index)], axis=1),
+        'signals': {
+            'composite_signal': composite_signal.signal_type.value,
+            'composite_score': composite_signal.composite_score,
+            'composite_confidence': composite_signal.confidence,
+            'legacy_signal': legacy_signal,
+            'legacy_score': legacy_score
+        },
+        'strategy_summary': strategy_summary,
+    }
+
+
+def render_chart(chart_generator, payload):
+    """Draw a chart from build_chart_payload; safe to run in a chart worker process."""
+    try:
+        return chart_generator.generate_comprehensive_chart(
+            payload['symbol'], payload['data'], payload['signals'], payload['strategy_summary']
+        )
+    finally:
+        flush_log_buffers()
+
+
+def publish_signal_outputs(symbol, logger, data, composite_signal, legacy_signal, legacy_score,
+                           strategy_summary, email_service=None, chart_generator=None, indicators=None):
+    """
+    Send the email notification and draw the chart for an analyzed symbol.
+    
+    Legacy indicators are recalculated from data when they are not passed in.
+    
+    Returns:
+        Path of the generated chart, or None
+    """
+    # Send email notification if configured
+    if email_service and composite_signal:
+        try:
+            email_service.send_signal_notification(composite_signal, symbol)
+        except Exception as e:
+            logger.error(f"Email notification failed for {symbol}: {e}")
+    
+    # Generate chart if configured and signal is strong enough
+    chart_path = None
+    if chart_generator:
+        try:
+            payload = build_chart_payload(symbol, data, composite_signal, legacy_signal, legacy_score,
+                                          strategy_summary, indicators)
+            if payload:
+                chart_path = render_chart(chart_generator, payload)
+            if chart_path:
+                logger.info(f"Chart generated for {symbol}: {chart_path}")
+        except Exception as e:
+            logger.error(f"Chart generation failed for {symbol}: {e}")
+    
+    return chart_path
 
 
 def analyze_symbol_multi_strategy(symbol, logger, config=None, strategies=None, 
-                                email_service=None, scorer=None, chart_generator=None, db_manager=None):
-    """Analyze a single NIFTY symbol with multiple strategies."""
+                                email_service=None, scorer=None, chart_generator=None, db_manager=None,
+                                data=None, period_used=None, return_composite=False):
+    """Analyze a single NIFTY symbol with multiple strategies.
+    
+    Pass pre-fetched history (see fetch_all) as data to skip the per-symbol
+    download. With return_composite set, returns (result, composite_signal)
+    so notifications can be published by the caller.
+    """
+    failed = (None, None) if return_composite else None
+    
     try:
         logger.info(f"Analyzing {symbol}...")
         
-        # Fetch comprehensive data for Indian stocks
-        ticker = yf.Ticker(symbol)
-        
-        # Get data fetching configuration
-        if config and 'data_fetching' in config:
-            data_config = config['data_fetching']
-            max_period = data_config.get('max_data_period', 'max')
-            fallback_periods = data_config.get('fallback_periods', ["max", "10y", "5y", "2y", "1y", "6mo"])
-            min_threshold = data_config.get('min_data_threshold', 200)
-        else:
-            # Default configuration prioritizing maximum data
-            max_period = "max"
-            fallback_periods = ["max", "10y", "5y", "2y", "1y", "6mo"]
-            min_threshold = 200
-        
-        # Try different periods to get maximum data, starting with "max"
-        periods_to_try = fallback_periods if max_period == "max" else [max_period] + [p for p in fallback_periods if p != max_period]
-        data = None
+        periods_to_try, min_threshold = get_fetch_settings(config)
         
-        period_used = None
-        for period in periods_to_try:
-            try:
-                logger.debug(f"Attempting to fetch {period} data for {symbol}...")
-                data = ticker.history(period=period)
-                if not data.empty and len(data) >= min_threshold:
-                    period_used = period
-                    logger.debug(f"Successfully fetched {len(data)} days of data for {symbol} (period: {period})")
-                    break
-                else:
-                    logger.debug(f"Insufficient data with {period} period for {symbol}: {len(data) if data is not None and not data.empty else 0} days")
-            except Exception as e:
-                logger.debug(f"Failed to fetch {period} data for {symbol}: {e}")
-                continue
+        if data is None:
+            # Fetch comprehensive data for Indian stocks
+            data, period_used = fetch_symbol_history(symbol, logger, periods_to_try, min_threshold)
         
         if data is None or data.empty or len(data) < min_threshold:
             logger.warning(f"Insufficient data for {symbol} (need {min_threshold}+ days for analysis, got {len(data) if data is not None and not data.empty else 0})")
-            return None
+            return failed
+        
+        # Reuse the stored result if this history was already analyzed
+        cached = load_cached_signal(symbol, data, config)
+        if cached is not None:
+            result, composite_signal = cached
+            logger.info(f"{symbol}: using cached analysis for {data.index[-1].date()}")
+            chart_path = publish_signal_outputs(
+                symbol, logger, data, composite_signal, result['legacy_signal'], result['legacy_score'],
+                result['strategy_signals'], email_service, chart_generator
+            )
+            if chart_path:
+                result['chart_path'] = chart_path
+            if db_manager and composite_signal:
+                logger.info(f"{symbol}: cached analysis was already stored in the database, skipping")
+            return (result, composite_signal) if return_composite else result
         
         # Show enhanced data summary
         start_date = data.index.min().strftime('%Y-%m-%d')
@@ -264,30 +1036,32 @@ def analyze_symbol_multi_strategy(symbol, logger, config=None, strategies=None,
         if years_span < 1.0:
             logger.warning(f"{symbol}: Limited historical data ({years_span:.1f} years) - signals may be less reliable")
         
-        # Calculate legacy indicators
-        rsi_values = calculate_multiple_rsi(data['Close'])
-        for key, values in rsi_values.items():
-            data[key] = values
-        
-        ema_values = calculate_multiple_ema(data['Close'])
-        for key, values in ema_values.items():
-            data[key] = values
-        
-        data['BB_Upper'], data['BB_Middle'], data['BB_Lower'] = calculate_bollinger_bands(data['Close'])
-        data['MACD'], data['MACD_Signal'], data['MACD_Histogram'] = calculate_macd(data['Close'])
+        # Legacy indicators: resume the EWM recurrences from the saved state, keeping
+        # a session that is still trading out of what gets saved
+        final_bars = len(data)
+        if is_market_hours() and data.index[-1].date() == ist_now().date():
+            final_bars -= 1
+        latest, ema_state = latest_legacy_values(data['Close'], load_ema_state(symbol, config), final_bars)
+        save_ema_state(symbol, ema_state, config)
+        latest['Close'] = data['Close'].to_numpy()[-1]
         
         # Generate legacy signal
-        legacy_signal, legacy_score = generate_legacy_signal(data)
+        legacy_signal, legacy_score = score_legacy_signal(latest)
         
         # Generate new strategy signals
         strategy_signals = []
         
+        # Skip formatting per-strategy debug messages unless they will be emitted
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        
         if strategies:
+            features = build_feature_bundle(data, strategies)
             for strategy_name, strategy in strategies.items():
                 try:
-                    signal = strategy.generate_signal(data, {})
+                    signal = strategy.generate_signal(data, features)
                     strategy_signals.append(signal)
-                    logger.debug(f"{symbol} - {strategy_name}: {signal.signal_type.value} (confidence: {signal.confidence:.2f})")
+                    if debug_enabled:
+                        logger.debug(f"{symbol} - {strategy_name}: {signal.signal_type.value} (confidence: {signal.confidence:.2f})")
                 except Exception as e:
                     logger.error(f"Strategy {strategy_name} failed for {symbol}: {e}")
         
@@ -296,38 +1070,20 @@ def analyze_symbol_multi_strategy(symbol, logger, config=None, strategies=None,
         if strategy_signals and scorer:
             try:
                 composite_signal = scorer.calculate_composite_score(strategy_signals, symbol)
-                logger.debug(f"{symbol} - Composite: {composite_signal.signal_type.value} (score: {composite_signal.composite_score:.1f})")
+                if debug_enabled:
+                    logger.debug(f"{symbol} - Composite: {composite_signal.signal_type.value} (score: {composite_signal.composite_score:.1f})")
             except Exception as e:
                 logger.error(f"Composite scoring failed for {symbol}: {e}")
         
-        # Send email notification if configured
-        if email_service and composite_signal:
-            try:
-                email_service.send_signal_notification(composite_signal, symbol)
-            except Exception as e:
-                logger.error(f"Email notification failed for {symbol}: {e}")
+        strategy_summary = {signal.strategy_name: {
+            'signal': signal.signal_type.value,
+            'confidence': signal.confidence
+        } for signal in strategy_signals}
         
-        # Generate chart if configured and signal is strong enough
-        chart_path = None
-        if (chart_generator and composite_signal and 
-            abs(composite_signal.composite_score) >= 30.0):
-            try:
-                chart_path = chart_generator.generate_comprehensive_chart(
-                    symbol, data, {
-                        'composite_signal': composite_signal.signal_type.value,
-                        'composite_score': composite_signal.composite_score,
-                        'composite_confidence': composite_signal.confidence,
-                        'legacy_signal': legacy_signal,
-                        'legacy_score': legacy_score
-                    }, {signal.strategy_name: {
-                        'signal': signal.signal_type.value,
-                        'confidence': signal.confidence
-                    } for signal in strategy_signals}
-                )
-                if chart_path:
-                    logger.info(f"Chart generated for {symbol}: {chart_path}")
-            except Exception as e:
-                logger.error(f"Chart generation failed for {symbol}: {e}")
+        chart_path = publish_signal_outputs(
+            symbol, logger, data, composite_signal, legacy_signal, legacy_score,
+            strategy_summary, email_service, chart_generator
+        )
         
         # Store enhanced signal in database if configured
         if db_manager and composite_signal:
@@ -377,12 +1133,11 @@ def analyze_symbol_multi_strategy(symbol, logger, config=None, strategies=None,
                     ))
                     conn.commit()
                 
-                logger.debug(f"Enhanced signal stored in database for {symbol}")
+                logger.debug("Enhanced signal stored in database for %s", symbol)
                 
             except Exception as e:
                 logger.error(f"Database storage failed for {symbol}: {e}")
         
-        latest = data.iloc[-1]
         current_price = latest['Close']
         
         result = {
@@ -399,10 +1154,7 @@ def analyze_symbol_multi_strategy(symbol, logger, config=None, strategies=None,
             'composite_confidence': composite_signal.confidence if composite_signal else 0.0,
             
             # Individual strategy signals
-            'strategy_signals': {signal.strategy_name: {
-                'signal': signal.signal_type.value,
-                'confidence': signal.confidence
-            } for signal in strategy_signals},
+            'strategy_signals': strategy_summary,
             
             'price': current_price,
             
@@ -449,11 +1201,64 @@ def analyze_symbol_multi_strategy(symbol, logger, config=None, strategies=None,
                        f"Price: Rs.{current_price:.2f} [{trend_text}] | "
                        f"RSI(14/21/50): {latest['RSI_14']:.1f}/{latest['RSI_21']:.1f}/{latest['RSI_50']:.1f}")
         
-        return result
+        try:
+            save_cached_signal(result, data, config, composite_signal)
+        except Exception as e:
+            logger.warning(f"Failed to cache analysis for {symbol}: {e}")
+        
+        return (result, composite_signal) if return_composite else result
         
     except Exception as e:
         logger.error(f"Error analyzing {symbol}: {e}")
-        return None
+        return failed
+
+
+# Per-process analysis state, set up by _init_analysis_worker
+_worker_logger = None
+_worker_config = None
+_worker_strategies = None
+_worker_scorer = None
+
+
+def _init_analysis_worker(config, verbose=False):
+    """Build the strategies and scorer once per analysis worker process."""
+    global _worker_logger, _worker_config, _worker_strategies, _worker_scorer
+    
+    _worker_logger = setup_logging(verbose, config.get('output'))
+    _worker_config = config
+    _worker_strategies, strategy_weights = initialize_strategies(config)
+    _worker_scorer = MultiStrategyScorer(strategy_weights) if _worker_strategies else None
+
+
+def create_analysis_pool(max_workers, config, strategies, scorer, verbose=False):
+    """
+    Create the process pool that runs analyze_symbol_multi_strategy.
+    
+    On Linux the workers are forked, inheriting the strategies and scorer
+    already built in this process. Elsewhere fork is unavailable or unsafe,
+    so each spawned worker rebuilds them in _init_analysis_worker.
+    """
+    global _worker_logger, _worker_config, _worker_strategies, _worker_scorer
+    
+    if sys.platform.startswith('linux'):
+        _worker_logger, _worker_config = logging.getLogger(__name__), config
+        _worker_strategies, _worker_scorer = strategies, scorer
+        return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('fork'))
+    
+    return ProcessPoolExecutor(max_workers=max_workers, initializer=_init_analysis_worker,
+                               initargs=(config, verbose))
+
+
+def _analyze_symbol_task(payload):
+    """Analyze one (symbol, data, period_used) payload in a worker process."""
+    symbol, data, period_used = payload
+    try:
+        return analyze_symbol_multi_strategy(
+            symbol, _worker_logger, _worker_config, _worker_strategies, scorer=_worker_scorer,
+            data=data, period_used=period_used, return_composite=True
+        )
+    finally:
+        flush_log_buffers()
 
 
 def load_enhanced_config(config_file=None, size="nifty500"):
@@ -471,9 +1276,9 @@ def load_enhanced_config(config_file=None, size="nifty500"):
     
     try:
         if Path(config_path).exists():
-            with open(config_path, 'r') as f:
-                config = yaml.safe_load(f)
-                return validate_enhanced_config(config)
+            stat = Path(config_path).stat()
+            # Callers may modify their config, so never hand out the cached one
+            return copy.deepcopy(_load_validated_config(str(config_path), stat.st_mtime_ns, stat.st_size))
         else:
             logger.warning(f"Config file {config_path} not found, using defaults")
             return get_default_enhanced_config()
@@ -482,6 +1287,13 @@ def load_enhanced_config(config_file=None, size="nifty500"):
         return get_default_enhanced_config()
 
 
+@functools.lru_cache(maxsize=8)
+def _load_validated_config(config_path, mtime_ns, size):
+    """Read and validate a config file; cached until the file changes."""
+    with open(config_path, 'r') as f:
+        return validate_enhanced_config(yaml.safe_load(f))
+
+
 def get_default_enhanced_config():
     """Get default enhanced configuration."""
     return {
@@ -531,6 +1343,7 @@ def get_default_enhanced_config():
         'output': {
             'base_directory': 'output',
             'signals_directory': 'signals',
+            'write_csv': False,
             'logs_directory': 'logs',
             'charts_directory': 'charts'
         },
@@ -601,8 +1414,15 @@ def initialize_email_service(config):
         return None
 
 
-def save_enhanced_results(results, filename="enhanced_multi_strategy_signals.csv", output_config=None):
-    """Save enhanced results with multi-strategy information."""
+def save_enhanced_results(results, filename="enhanced_multi_strategy_signals.parquet", output_config=None):
+    """
+    Save enhanced results with multi-strategy information.
+    
+    Results are written as zstd-compressed Parquet, with each strategy's
+    signal and confidence flattened into strategy_<name>_signal and
+    strategy_<name>_confidence columns. A CSV copy is written as well when
+    output.write_csv is set.
+    """
     if not results:
         return
     
@@ -614,26 +1434,44 @@ def save_enhanced_results(results, filename="enhanced_multi_strategy_signals.csv
         output_path.mkdir(parents=True, exist_ok=True)
         full_filename = output_path / filename
     else:
-        full_filename = filename
+        full_filename = Path(filename)
     
     df = pd.DataFrame(results)
     
+    # Flatten per-strategy signals into typed columns
+    if 'strategy_signals' in df.columns:
+        strategy_columns = pd.json_normalize(df.pop('strategy_signals').tolist(), sep='_')
+        strategy_columns.columns = 'strategy_' + strategy_columns.columns.str.lower()
+        strategy_columns.index = df.index
+        df = pd.concat([df, strategy_columns], axis=1)
+    
     # Format for Indian market
-    df['price_inr'] = df['price'].apply(lambda x: f"Rs.{x:.2f}")
+    df['price_inr'] = np.char.mod('Rs.%.2f', df['price'].to_numpy(dtype=np.float64))
     
     # Add signal comparison
-    df['signal_agreement'] = df.apply(lambda row: 
-        'AGREE' if row['legacy_signal'] != 'NO_SIGNAL' and row['composite_signal'] != 'NO_SIGNAL' and 
-                  ((row['legacy_signal'] in ['BUY', 'STRONG_BUY'] and row['composite_signal'] == 'BUY') or
-                   (row['legacy_signal'] in ['SELL', 'STRONG_SELL'] and row['composite_signal'] == 'SELL'))
-        else 'DISAGREE' if row['legacy_signal'] != 'NO_SIGNAL' and row['composite_signal'] != 'NO_SIGNAL'
-        else 'PARTIAL', axis=1)
+    legacy_buy = df['legacy_signal'].isin(['BUY', 'STRONG_BUY'])
+    legacy_sell = df['legacy_signal'].isin(['SELL', 'STRONG_SELL'])
+    both_signal = df['legacy_signal'].ne('NO_SIGNAL') & df['composite_signal'].ne('NO_SIGNAL')
+    agree = (legacy_buy & df['composite_signal'].eq('BUY')) | (legacy_sell & df['composite_signal'].eq('SELL'))
+    df['signal_agreement'] = np.where(both_signal, np.where(agree, 'AGREE', 'DISAGREE'), 'PARTIAL')
     
     # Sort by composite score, then legacy score
     df = df.sort_values(['composite_score', 'legacy_score'], ascending=[False, False])
     
-    df.to_csv(full_filename, index=False)
-    print(f"Enhanced multi-strategy results saved to {full_filename}")
+    # Signal labels take a handful of values, so store them as categoricals
+    # (dictionary-encoded in Parquet and read back as category)
+    label_columns = ['legacy_signal', 'composite_signal', 'signal_agreement']
+    label_columns += [column for column in df.columns if column.startswith('strategy_') and column.endswith('_signal')]
+    df = df.astype({column: 'category' for column in label_columns if column in df.columns})
+    
+    parquet_file = full_filename.with_suffix('.parquet')
+    df.to_parquet(parquet_file, compression='zstd', engine='pyarrow', index=False)
+    print(f"Enhanced multi-strategy results saved to {parquet_file}")
+    
+    if output_config and output_config.get('write_csv', False):
+        csv_file = full_filename.with_suffix('.csv')
+        df.to_csv(csv_file, index=False)
+        print(f"CSV copy saved to {csv_file}")
 
 
 def main():
@@ -650,6 +1488,8 @@ def main():
     parser.add_argument("--min-composite-score", type=float, default=30.0, 
                        help="Minimum composite score to display (default: 30.0)")
     parser.add_argument("--email-test", action="store_true", help="Send test email")
+    parser.add_argument("--workers", type=int, default=None,
+                       help="Number of analysis worker processes (default: CPU count)")
     
     args = parser.parse_args()
     
@@ -733,35 +1573,93 @@ def main():
     signals_found = 0
     errors = 0
     
-    for i, symbol in enumerate(symbols, 1):
-        try:
-            print(f"Processing {symbol} ({i}/{len(symbols)})...", end=" ")
-            
-            result = analyze_symbol_multi_strategy(
-                symbol, logger, config, strategies, email_service, scorer, chart_generator
-            )
-            if result:
-                results.append(result)
-                if (result['composite_signal'] != 'NO_SIGNAL' and 
-                    abs(result['composite_score']) >= args.min_composite_score):
-                    signals_found += 1
-                print("[OK]")
-            else:
-                print("[ERR]")
+    # Fetch all price history up front in batches; after the close this is
+    # served from the parquet cache, and the signal cache is checked per symbol
+    # against the fetched history
+    print("Fetching price data...")
+    prefetched = fetch_all(symbols, logger, config)
+    
+    payloads = []
+    for symbol in symbols:
+        data, period_used = prefetched.get(symbol, (None, None))
+        if data is None:
+            logger.warning(f"No data fetched for {symbol}")
+            errors += 1
+            continue
+        payloads.append((symbol, data, period_used))
+    
+    # Indicator math runs across worker processes and charts render in a pool
+    # of their own while analysis continues; email stays in this process
+    chart_executor = ProcessPoolExecutor(max_workers=CHART_WORKERS) if chart_generator else None
+    chart_jobs = []
+    
+    with create_analysis_pool(args.workers, config, strategies, scorer, args.verbose) as executor:
+        analyses = executor.map(_analyze_symbol_task, payloads, chunksize=ANALYSIS_CHUNKSIZE)
+        progress = tqdm(total=len(payloads), desc='symbols') if tqdm else None
+        
+        for i, (symbol, data, _) in enumerate(payloads, 1):
+            try:
+                result, composite_signal = next(analyses)
+                if result:
+                    publish_signal_outputs(
+                        symbol, logger, data, composite_signal, result['legacy_signal'],
+                        result['legacy_score'], result['strategy_signals'], email_service
+                    )
+                    chart_payload = None
+                    if chart_executor:
+                        chart_payload = build_chart_payload(
+                            symbol, data, composite_signal, result['legacy_signal'],
+                            result['legacy_score'], result['strategy_signals']
+                        )
+                    if chart_payload:
+                        chart_jobs.append((result, data, composite_signal,
+                                           chart_executor.submit(render_chart, chart_generator, chart_payload)))
+                    results.append(result)
+                    if (result['composite_signal'] != 'NO_SIGNAL' and 
+                        abs(result['composite_score']) >= args.min_composite_score):
+                        signals_found += 1
+                else:
+                    logger.warning(f"Analysis failed for {symbol}")
+                    errors += 1
+                    
+            except KeyboardInterrupt:
+                print("\nStopped by user")
+                executor.shutdown(wait=False, cancel_futures=True)
+                if chart_executor:
+                    chart_executor.shutdown(wait=False, cancel_futures=True)
+                break
+            except Exception as e:
+                logger.error(f"Unexpected error with {symbol}: {e}")
                 errors += 1
-                
-        except KeyboardInterrupt:
-            print("\nStopped by user")
-            break
+            
+            if progress:
+                progress.update()
+            elif i % PROGRESS_INTERVAL == 0 or i == len(payloads):
+                print(f"Analyzed {i}/{len(payloads)} symbols")
+        
+        if progress:
+            progress.close()
+    
+    # Wait for the remaining charts; workers cached their results before the charts existed
+    for result, data, composite_signal, future in chart_jobs:
+        if future.cancelled():
+            continue
+        try:
+            chart_path = future.result()
         except Exception as e:
-            logger.error(f"Unexpected error with {symbol}: {e}")
-            errors += 1
-            print("❌")
+            logger.error(f"Chart generation failed for {result['symbol']}: {e}")
+            continue
+        if chart_path:
+            logger.info(f"Chart generated for {result['symbol']}: {chart_path}")
+            result['chart_path'] = chart_path
+            save_cached_signal(result, data, config, composite_signal)
+    if chart_executor:
+        chart_executor.shutdown()
     
     # Save results
     if results:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_file = f"enhanced_multi_strategy_{args.size}_signals_{timestamp}.csv"
+        output_file = f"enhanced_multi_strategy_{args.size}_signals_{timestamp}.parquet"
         save_enhanced_results(results, output_file, config.get('output'))
         
         print(f"\nEnhanced Multi-Strategy Analysis Complete!")
@@ -769,41 +1667,30 @@ def main():
         print(f"Quality signals found: {signals_found}")
         print(f"Errors: {errors}")
         
-        # Show high-quality composite signals
-        strong_buy = [r for r in results if r['composite_signal'] == 'BUY' and r['composite_score'] >= 60]
-        buy_signals = [r for r in results if r['composite_signal'] == 'BUY' and 30 <= r['composite_score'] < 60]
-        strong_sell = [r for r in results if r['composite_signal'] == 'SELL' and r['composite_score'] <= -60]
-        sell_signals = [r for r in results if r['composite_signal'] == 'SELL' and -60 < r['composite_score'] <= -30]
-        
-        if strong_buy:
-            print(f"\n🟢 STRONG BUY Signals ({len(strong_buy)}):")
-            for result in strong_buy[:5]:  # Show top 5
-                print(f"   {result['symbol']}: Score={result['composite_score']:.1f}, "
-                     f"Confidence={result['composite_confidence']:.1%}, "
-                     f"Price=Rs.{result['price']:.2f}")
-        
-        if buy_signals:
-            print(f"\n🟡 BUY Signals ({len(buy_signals)}):")
-            for result in buy_signals[:5]:  # Show top 5
-                print(f"   {result['symbol']}: Score={result['composite_score']:.1f}, "
-                     f"Confidence={result['composite_confidence']:.1%}, "
-                     f"Price=Rs.{result['price']:.2f}")
-        
-        if strong_sell:
-            print(f"\n🔴 STRONG SELL Signals ({len(strong_sell)}):")
-            for result in strong_sell[:5]:  # Show top 5
-                print(f"   {result['symbol']}: Score={result['composite_score']:.1f}, "
-                     f"Confidence={result['composite_confidence']:.1%}, "
-                     f"Price=Rs.{result['price']:.2f}")
-        
-        if sell_signals:
-            print(f"\n🟠 SELL Signals ({len(sell_signals)}):")
-            for result in sell_signals[:5]:  # Show top 5
-                print(f"   {result['symbol']}: Score={result['composite_score']:.1f}, "
-                     f"Confidence={result['composite_confidence']:.1%}, "
-                     f"Price=Rs.{result['price']:.2f}")
-        
-        if not any([strong_buy, buy_signals, strong_sell, sell_signals]):
+        # Show high-quality composite signals, bucketed with column masks
+        summary = pd.DataFrame(results, columns=['symbol', 'composite_signal', 'composite_score',
+                                                 'composite_confidence', 'price'])
+        is_buy = (summary['composite_signal'] == 'BUY').to_numpy()
+        is_sell = (summary['composite_signal'] == 'SELL').to_numpy()
+        score = summary['composite_score'].to_numpy()
+        buckets = [
+            ("🟢 STRONG BUY", is_buy & (score >= 60)),
+            ("🟡 BUY", is_buy & (score >= 30) & (score < 60)),
+            ("🔴 STRONG SELL", is_sell & (score <= -60)),
+            ("🟠 SELL", is_sell & (score > -60) & (score <= -30)),
+        ]
+        
+        for label, mask in buckets:
+            selected = summary[mask]
+            if selected.empty:
+                continue
+            print(f"\n{label} Signals ({len(selected)}):")
+            for result in selected.head(5).itertuples(index=False):  # Show top 5
+                print(f"   {result.symbol}: Score={result.composite_score:.1f}, "
+                     f"Confidence={result.composite_confidence:.1%}, "
+                     f"Price=Rs.{result.price:.2f}")
+        
+        if not any(mask.any() for _, mask in buckets):
             print(f"\nNo high-quality composite signals found (min score: {args.min_composite_score})")
         
         # Strategy performance summary
@@ -830,7 +1717,8 @@ def main():
 
 
 if __name__ == "__main__":
-    import sys
+    # Analysis workers re-enter this script in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     try:
         exit_code = main()
         sys.exit(exit_code)
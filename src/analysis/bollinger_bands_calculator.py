@@ -11,6 +11,7 @@ from typing import Dict
 
 from interfaces.indicator import IndicatorInterface
 from models.exceptions import IndicatorError
+from utils._rolling import rolling_mean_std
 
 
 class BollingerBandsCalculator(IndicatorInterface):
@@ -47,11 +48,15 @@ class BollingerBandsCalculator(IndicatorInterface):
             
             close_prices = data['Close']
             
-            # Calculate middle band (Simple Moving Average)
-            middle_band = close_prices.rolling(window=period).mean()
-            
-            # Calculate standard deviation
-            rolling_std = close_prices.rolling(window=period).std()
+            # Calculate middle band (Simple Moving Average) and standard deviation
+            # from running sums; a one-bar window has no sample std, so leave that to pandas
+            if period > 1:
+                mean, std = rolling_mean_std(close_prices.to_numpy(dtype=np.float64), period)
+                middle_band = pd.Series(mean, index=close_prices.index, name=close_prices.name)
+                rolling_std = pd.Series(std, index=close_prices.index, name=close_prices.name)
+            else:
+                middle_band = close_prices.rolling(window=period).mean()
+                rolling_std = close_prices.rolling(window=period).std()
             
             # Calculate upper and lower bands
             upper_band = middle_band + (rolling_std * std_dev)
@@ -11,6 +11,7 @@ from typing import Dict
 
 from src.interfaces.indicator import IndicatorInterface
 from src.models.exceptions import IndicatorError
+from src.utils._ewm import ewm_spans
 
 
 class EMACalculator(IndicatorInterface):
@@ -46,8 +47,9 @@ class EMACalculator(IndicatorInterface):
             
             close_prices = data['Close']
             
-            # Calculate EMA using pandas ewm function
-            ema = close_prices.ewm(span=period, adjust=False).mean()
+            # Calculate EMA with the numba EWM kernel
+            ema = pd.Series(ewm_spans(close_prices.to_numpy(dtype=np.float64), [period])[0],
+                            index=close_prices.index, name=close_prices.name)
             
             self.logger.debug(f"Calculated EMA with period {period}")
             return ema
@@ -117,15 +119,18 @@ class EMACalculator(IndicatorInterface):
                 raise IndicatorError("Data must contain 'Close' column for EMA calculation")
             
             close_prices = data['Close']
-            result = pd.DataFrame(index=data.index)
             
+            valid_periods = []
             for period in periods:
                 if not isinstance(period, int) or period < 1:
                     self.logger.warning(f"Invalid EMA period: {period}, skipping")
                     continue
-                
-                ema = close_prices.ewm(span=period, adjust=False).mean()
-                result[f'ema_{period}'] = ema
+                valid_periods.append(period)
+            
+            # All periods in one pass of the EWM kernel
+            emas = ewm_spans(close_prices.to_numpy(dtype=np.float64), valid_periods)
+            result = pd.DataFrame({f'ema_{period}': ema for period, ema in zip(valid_periods, emas)},
+                                  index=data.index)
             
             self.logger.debug(f"Calculated EMAs for periods: {periods}")
             return result
@@ -186,7 +191,8 @@ class EMACalculator(IndicatorInterface):
             raise IndicatorError(f"EMA slope calculation failed: {e}")
     
     def calculate_ema_crossover_signals(self, data: pd.DataFrame, short_period: int = 50, 
-                                      long_period: int = 200, approach_threshold: float = 0.02) -> Dict:
+                                      long_period: int = 200, approach_threshold: float = 0.02,
+                                      short_ema: pd.Series = None, long_ema: pd.Series = None) -> Dict:
         """
         Calculate EMA crossover signals between two EMAs.
         
@@ -195,6 +201,8 @@ class EMACalculator(IndicatorInterface):
             short_period: Short EMA period (default 50)
             long_period: Long EMA period (default 200)
             approach_threshold: Threshold for "approaching" signals as percentage (default 2%)
+            short_ema: Precomputed short EMA series (calculated from data if omitted)
+            long_ema: Precomputed long EMA series (calculated from data if omitted)
             
         Returns:
             Dictionary with EMA values, crossover signals, and signal strength
@@ -208,9 +216,13 @@ class EMACalculator(IndicatorInterface):
             
             close_prices = data['Close']
             
-            # Calculate EMAs
-            short_ema = close_prices.ewm(span=short_period, adjust=False).mean()
-            long_ema = close_prices.ewm(span=long_period, adjust=False).mean()
+            # Calculate EMAs unless they were precomputed
+            if short_ema is None or long_ema is None:
+                emas = ewm_spans(close_prices.to_numpy(dtype=np.float64), [short_period, long_period])
+                if short_ema is None:
+                    short_ema = pd.Series(emas[0], index=data.index, name=close_prices.name)
+                if long_ema is None:
+                    long_ema = pd.Series(emas[1], index=data.index, name=close_prices.name)
             
             # Calculate EMA convergence (percentage difference)
             ema_convergence = ((short_ema - long_ema) / long_ema * 100).fillna(0)
@@ -238,12 +250,9 @@ class EMACalculator(IndicatorInterface):
             approaching_mask = (ema_distance_pct <= approach_threshold * 100) & (signals == 0)
             
             # Determine approaching direction
-            for i in range(len(data)):
-                if approaching_mask.iloc[i]:
-                    if ema_convergence.iloc[i] > 0:
-                        crossover_type.iloc[i] = 'approaching_bearish'  # Short above but close
-                    else:
-                        crossover_type.iloc[i] = 'approaching_bullish'  # Short below but close
+            short_above = ema_convergence > 0
+            crossover_type[approaching_mask & short_above] = 'approaching_bearish'  # Short above but close
+            crossover_type[approaching_mask & ~short_above] = 'approaching_bullish'  # Short below but close
             
             # Calculate signal strength based on EMA convergence and price action
             signal_strength = self._calculate_crossover_strength(
@@ -281,35 +290,29 @@ class EMACalculator(IndicatorInterface):
             Series with signal strength values (0.0 to 1.0)
         """
         try:
-            close_prices = data['Close']
-            signal_strength = pd.Series(0.0, index=data.index)
-            
-            for i in range(len(data)):
-                crossover = crossover_type.iloc[i]
-                
-                if crossover in ['bullish', 'bearish']:
-                    # Strong signal for actual crossovers
-                    # Factor in price position relative to EMAs
-                    price = close_prices.iloc[i]
-                    short_val = short_ema.iloc[i]
-                    long_val = long_ema.iloc[i]
-                    
-                    if crossover == 'bullish':
-                        # Bullish crossover strength
-                        price_confirmation = 1.0 if price > short_val else 0.5
-                        ema_momentum = min(1.0, abs(ema_convergence.iloc[i]) / 5.0)  # Normalize to 5%
-                        signal_strength.iloc[i] = min(1.0, (price_confirmation + ema_momentum) / 2)
-                    
-                    elif crossover == 'bearish':
-                        # Bearish crossover strength
-                        price_confirmation = 1.0 if price < short_val else 0.5
-                        ema_momentum = min(1.0, abs(ema_convergence.iloc[i]) / 5.0)
-                        signal_strength.iloc[i] = min(1.0, (price_confirmation + ema_momentum) / 2)
-                
-                elif crossover in ['approaching_bullish', 'approaching_bearish']:
-                    # Moderate signal for approaching crossovers
-                    convergence_strength = 1.0 - (abs(ema_convergence.iloc[i]) / 2.0)  # Closer = stronger
-                    signal_strength.iloc[i] = max(0.3, min(0.7, convergence_strength))
+            close_prices = data['Close'].to_numpy()
+            short_values = short_ema.to_numpy()
+            abs_convergence = np.abs(ema_convergence.to_numpy())
+            crossover = crossover_type.to_numpy()
+            
+            # Strong signal for actual crossovers, factoring in price position
+            # relative to the short EMA and EMA momentum (normalized to 5%)
+            ema_momentum = np.minimum(1.0, abs_convergence / 5.0)
+            bullish_strength = np.minimum(1.0, (np.where(close_prices > short_values, 1.0, 0.5) + ema_momentum) / 2)
+            bearish_strength = np.minimum(1.0, (np.where(close_prices < short_values, 1.0, 0.5) + ema_momentum) / 2)
+            
+            # Moderate signal for approaching crossovers - closer = stronger
+            approaching_strength = np.maximum(0.3, np.minimum(0.7, 1.0 - abs_convergence / 2.0))
+            
+            signal_strength = pd.Series(np.select(
+                [
+                    crossover == 'bullish',
+                    crossover == 'bearish',
+                    (crossover == 'approaching_bullish') | (crossover == 'approaching_bearish')
+                ],
+                [bullish_strength, bearish_strength, approaching_strength],
+                default=0.0
+            ), index=data.index)
             
             return signal_strength
             
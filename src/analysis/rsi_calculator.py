@@ -11,6 +11,7 @@ from typing import Dict
 
 from src.interfaces.indicator import IndicatorInterface
 from src.models.exceptions import IndicatorError
+from src.utils._ewm import ewm_spans
 
 
 class RSICalculator(IndicatorInterface):
@@ -53,9 +54,12 @@ class RSICalculator(IndicatorInterface):
             gains = delta.where(delta > 0, 0)
             losses = -delta.where(delta < 0, 0)
             
-            # Calculate average gains and losses using exponential moving average
-            avg_gains = gains.ewm(span=period, adjust=False).mean()
-            avg_losses = losses.ewm(span=period, adjust=False).mean()
+            # Calculate average gains and losses using exponential moving average,
+            # both as columns of one pass of the EWM kernel
+            averages = ewm_spans(np.column_stack([gains.to_numpy(dtype=np.float64),
+                                                  losses.to_numpy(dtype=np.float64)]), [period])[0]
+            avg_gains = pd.Series(averages[:, 0], index=close_prices.index, name=close_prices.name)
+            avg_losses = pd.Series(averages[:, 1], index=close_prices.index, name=close_prices.name)
             
             # Calculate RS (Relative Strength)
             rs = avg_gains / avg_losses
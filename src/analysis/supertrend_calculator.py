@@ -11,6 +11,73 @@ from typing import Dict, Tuple
 
 from src.interfaces.indicator import IndicatorInterface
 from src.models.exceptions import IndicatorError
+from src.utils._ewm import ewm_spans
+from src.utils._njit import njit
+
+
+@njit(cache=True)
+def _supertrend_loop(high, low, close, atr, multiplier):
+    """
+    Run the bar-by-bar SuperTrend recurrence on NumPy arrays.
+    
+    Args:
+        high, low, close, atr: float64 arrays of equal length
+        multiplier: SuperTrend multiplier
+        
+    Returns:
+        Tuple of (supertrend values, trend direction) where trend direction
+        is 1 for up and -1 for down
+    """
+    n = len(close)
+    supertrend = np.empty(n, dtype=np.float64)
+    trend_direction = np.empty(n, dtype=np.int8)
+    
+    if n == 0:
+        return supertrend, trend_direction
+    
+    # Calculate basic upper and lower bands
+    hl_avg = (high + low) / 2
+    upper_band = hl_avg + (multiplier * atr)
+    lower_band = hl_avg - (multiplier * atr)
+    
+    # Set initial values
+    supertrend[0] = lower_band[0]
+    trend_direction[0] = 1
+    
+    for i in range(1, n):
+        curr_close = close[i]
+        curr_upper = upper_band[i]
+        curr_lower = lower_band[i]
+        prev_close = close[i - 1]
+        
+        # Adjust bands based on previous values
+        if curr_upper < upper_band[i - 1] or prev_close > upper_band[i - 1]:
+            final_upper = curr_upper
+        else:
+            final_upper = upper_band[i - 1]
+        
+        if curr_lower > lower_band[i - 1] or prev_close < lower_band[i - 1]:
+            final_lower = curr_lower
+        else:
+            final_lower = lower_band[i - 1]
+        
+        # Determine trend direction and SuperTrend value
+        if trend_direction[i - 1] == 1:  # Previous trend was up
+            if curr_close <= final_lower:
+                supertrend[i] = final_upper
+                trend_direction[i] = -1
+            else:
+                supertrend[i] = final_lower
+                trend_direction[i] = 1
+        else:  # Previous trend was down
+            if curr_close >= final_upper:
+                supertrend[i] = final_lower
+                trend_direction[i] = 1
+            else:
+                supertrend[i] = final_upper
+                trend_direction[i] = -1
+    
+    return supertrend, trend_direction
 
 
 class SuperTrendCalculator(IndicatorInterface):
@@ -84,7 +151,7 @@ class SuperTrendCalculator(IndicatorInterface):
         true_range = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
         
         # Calculate ATR using exponential moving average
-        atr = true_range.ewm(span=period, adjust=False).mean()
+        atr = pd.Series(ewm_spans(true_range.to_numpy(dtype=np.float64), [period])[0], index=data.index)
         
         return atr
     
@@ -100,73 +167,24 @@ class SuperTrendCalculator(IndicatorInterface):
         Returns:
             Series with SuperTrend values
         """
-        high = data['High']
-        low = data['Low']
-        close = data['Close']
-        
-        # Calculate basic upper and lower bands
-        hl_avg = (high + low) / 2
-        upper_band = hl_avg + (multiplier * atr)
-        lower_band = hl_avg - (multiplier * atr)
-        
-        # Initialize SuperTrend series
-        supertrend = pd.Series(index=data.index, dtype=float)
-        trend_direction = pd.Series(index=data.index, dtype=int)  # 1 for up, -1 for down
-        
-        # Set initial values
-        supertrend.iloc[0] = lower_band.iloc[0]
-        trend_direction.iloc[0] = 1
+        supertrend, _ = _supertrend_loop(
+            data['High'].to_numpy(dtype=np.float64),
+            data['Low'].to_numpy(dtype=np.float64),
+            data['Close'].to_numpy(dtype=np.float64),
+            atr.to_numpy(dtype=np.float64),
+            float(multiplier)
+        )
         
-        # Calculate SuperTrend values
-        for i in range(1, len(data)):
-            # Current values
-            curr_close = close.iloc[i]
-            curr_upper = upper_band.iloc[i]
-            curr_lower = lower_band.iloc[i]
-            prev_close = close.iloc[i-1]
-            prev_supertrend = supertrend.iloc[i-1]
-            prev_trend = trend_direction.iloc[i-1]
-            
-            # Adjust bands based on previous values
-            if curr_upper < upper_band.iloc[i-1] or prev_close > upper_band.iloc[i-1]:
-                final_upper = curr_upper
-            else:
-                final_upper = upper_band.iloc[i-1]
-            
-            if curr_lower > lower_band.iloc[i-1] or prev_close < lower_band.iloc[i-1]:
-                final_lower = curr_lower
-            else:
-                final_lower = lower_band.iloc[i-1]
-            
-            # Determine trend direction and SuperTrend value
-            if prev_trend == 1:  # Previous trend was up
-                if curr_close <= final_lower:
-                    # Trend changes to down
-                    supertrend.iloc[i] = final_upper
-                    trend_direction.iloc[i] = -1
-                else:
-                    # Trend continues up
-                    supertrend.iloc[i] = final_lower
-                    trend_direction.iloc[i] = 1
-            else:  # Previous trend was down
-                if curr_close >= final_upper:
-                    # Trend changes to up
-                    supertrend.iloc[i] = final_lower
-                    trend_direction.iloc[i] = 1
-                else:
-                    # Trend continues down
-                    supertrend.iloc[i] = final_upper
-                    trend_direction.iloc[i] = -1
-        
-        return supertrend
+        return pd.Series(supertrend, index=data.index)
     
-    def calculate_with_signals(self, data: pd.DataFrame, params: Dict) -> Dict:
+    def calculate_with_signals(self, data: pd.DataFrame, params: Dict, atr: pd.Series = None) -> Dict:
         """
         Calculate SuperTrend with trend direction and signals.
         
         Args:
             data: DataFrame with OHLCV data
             params: Dictionary with SuperTrend parameters
+            atr: Precomputed ATR series for params' atr_period (calculated from data if omitted)
             
         Returns:
             Dictionary with 'supertrend', 'trend_direction', 'signals', and 'atr'
@@ -175,34 +193,24 @@ class SuperTrendCalculator(IndicatorInterface):
             atr_period = params.get('atr_period', 10)
             multiplier = params.get('multiplier', 3.0)
             
-            # Calculate ATR
-            atr = self._calculate_atr(data, atr_period)
+            # Calculate ATR unless it was precomputed
+            if atr is None:
+                atr = self._calculate_atr(data, atr_period)
             
             # Calculate SuperTrend
             supertrend = self._calculate_supertrend_values(data, atr, multiplier)
             
             # Determine trend direction
-            close = data['Close']
-            trend_direction = pd.Series(index=data.index, dtype=str)
-            
-            for i in range(len(data)):
-                if close.iloc[i] > supertrend.iloc[i]:
-                    trend_direction.iloc[i] = 'bullish'
-                else:
-                    trend_direction.iloc[i] = 'bearish'
-            
-            # Generate signals (trend changes)
-            signals = pd.Series(0, index=data.index)
-            prev_trend = None
-            
-            for i in range(len(data)):
-                curr_trend = trend_direction.iloc[i]
-                if prev_trend is not None and prev_trend != curr_trend:
-                    if curr_trend == 'bullish':
-                        signals.iloc[i] = 1  # Buy signal
-                    else:
-                        signals.iloc[i] = -1  # Sell signal
-                prev_trend = curr_trend
+            is_bullish = (data['Close'] > supertrend).to_numpy()
+            trend_direction = pd.Series(np.where(is_bullish, 'bullish', 'bearish'),
+                                        index=data.index, dtype=str)
+            
+            # Generate signals (trend changes): 1 = buy, -1 = sell
+            signal_values = np.zeros(len(data), dtype=np.int64)
+            if len(data) > 1:
+                changed = is_bullish[1:] != is_bullish[:-1]
+                signal_values[1:] = np.where(changed, np.where(is_bullish[1:], 1, -1), 0)
+            signals = pd.Series(signal_values, index=data.index)
             
             return {
                 'supertrend': supertrend,
@@ -314,9 +322,9 @@ class SuperTrendCalculator(IndicatorInterface):
             if len(data) == 0:
                 return 0.0
             
-            current_price = data['Close'].iloc[-1]
-            current_supertrend = supertrend_data['supertrend'].iloc[-1]
-            current_atr = supertrend_data['atr'].iloc[-1]
+            current_price = data['Close'].iat[-1]
+            current_supertrend = supertrend_data['supertrend'].iat[-1]
+            current_atr = supertrend_data['atr'].iat[-1]
             
             # Calculate distance from SuperTrend as percentage of ATR
             distance = abs(current_price - current_supertrend)
@@ -148,8 +148,20 @@ class BacktestEngine:
         self.config = config or BacktestConfig()
         self.reset()
     
-    def reset(self):
-        """Reset backtest state."""
+    def reset(self, config: BacktestConfig = None):
+        """
+        Reset backtest state, optionally switching to a new configuration.
+        
+        Lets one engine be reused across parameter sweeps. Trade and equity
+        containers are replaced rather than cleared because earlier
+        BacktestResults keep references to them.
+        
+        Args:
+            config: New backtest configuration; keeps the current one if None
+        """
+        if config is not None:
+            self.config = config
+        
         self.current_capital = self.config.initial_capital
         self.positions: Dict[str, Position] = {}
         self.trades: List[Trade] = []
@@ -337,7 +349,7 @@ class BacktestEngine:
                                       composite_signal, "COMPOSITE")
                     
             except Exception as e:
-                logger.debug(f"Error generating signals for {symbol} on {current_date}: {e}")
+                logger.debug("Error generating signals for %s on %s: %s", symbol, current_date, e)
                 continue
     
     def _open_position(self, symbol: str, entry_date: datetime, entry_price: float, 
@@ -379,7 +391,7 @@ class BacktestEngine:
         self.positions[symbol] = position
         self.current_capital -= (position_value + commission)
         
-        logger.debug(f"Opened {position_type.value} position: {symbol} @ ₹{actual_entry_price:.2f}")
+        logger.debug("Opened %s position: %s @ ₹%.2f", position_type.value, symbol, actual_entry_price)
     
     def _close_position(self, symbol: str, exit_date: datetime, exit_price: float, 
                        exit_reason: str):
@@ -426,8 +438,8 @@ class BacktestEngine:
         # Remove position
         del self.positions[symbol]
         
-        logger.debug(f"Closed {position.position_type.value} position: {symbol} @ ₹{actual_exit_price:.2f}, "
-                    f"P&L: ₹{pnl:.2f} ({pnl_percent:.2f}%)")
+        logger.debug("Closed %s position: %s @ ₹%.2f, P&L: ₹%.2f (%.2f%%)",
+                     position.position_type.value, symbol, actual_exit_price, pnl, pnl_percent)
     
     def _close_all_positions(self, exit_date: datetime, data_dict: Dict[str, pd.DataFrame], 
                            exit_reason: str):
@@ -54,7 +54,8 @@ class EMACrossoverStrategy(StrategyInterface):
         
         Args:
             data: DataFrame with OHLCV data
-            indicators: Dictionary of calculated indicators (can be empty, will calculate EMAs)
+            indicators: Dictionary of calculated indicators; precomputed EMA series are
+                used from 'ema_<period>' keys, anything missing is calculated
             
         Returns:
             Signal object with trading recommendation
@@ -66,25 +67,27 @@ class EMACrossoverStrategy(StrategyInterface):
             if data.empty:
                 raise StrategyError("No data provided for signal generation")
             
-            # Get the latest data point
-            latest_data = data.iloc[-1]
+            # Get the latest data point without building a row Series
             latest_timestamp = data.index[-1]
-            symbol = getattr(latest_data, 'symbol', 'UNKNOWN')
+            symbol = data['symbol'].iat[-1] if 'symbol' in data.columns else 'UNKNOWN'
             
             # Calculate EMA crossover signals
+            indicators = indicators or {}
             crossover_data = self.ema_calculator.calculate_ema_crossover_signals(
-                data, self.short_period, self.long_period, self.approach_threshold
+                data, self.short_period, self.long_period, self.approach_threshold,
+                short_ema=indicators.get(f'ema_{self.short_period}'),
+                long_ema=indicators.get(f'ema_{self.long_period}')
             )
             
             # Get latest crossover information
-            latest_signal = crossover_data['signals'].iloc[-1]
-            latest_crossover_type = crossover_data['crossover_type'].iloc[-1]
-            latest_strength = crossover_data['signal_strength'].iloc[-1]
-            latest_short_ema = crossover_data['short_ema'].iloc[-1]
-            latest_long_ema = crossover_data['long_ema'].iloc[-1]
-            latest_convergence = crossover_data['ema_convergence'].iloc[-1]
+            latest_signal = crossover_data['signals'].iat[-1]
+            latest_crossover_type = crossover_data['crossover_type'].iat[-1]
+            latest_strength = crossover_data['signal_strength'].iat[-1]
+            latest_short_ema = crossover_data['short_ema'].iat[-1]
+            latest_long_ema = crossover_data['long_ema'].iat[-1]
+            latest_convergence = crossover_data['ema_convergence'].iat[-1]
             
-            current_price = latest_data['Close']
+            current_price = data['Close'].iat[-1]
             
             # Determine signal type based on crossover
             signal_type = SignalType.NO_SIGNAL
@@ -121,8 +124,8 @@ class EMACrossoverStrategy(StrategyInterface):
                 strategy_name=self.strategy_name
             )
             
-            self.logger.debug(f"Generated {signal_type.value} signal for {symbol} "
-                            f"({latest_crossover_type}) with confidence {confidence:.2f}")
+            self.logger.debug("Generated %s signal for %s (%s) with confidence %.2f",
+                              signal_type.value, symbol, latest_crossover_type, confidence)
             return signal
             
         except Exception as e:
@@ -245,8 +248,8 @@ class EMACrossoverStrategy(StrategyInterface):
             )
             
             # Get latest signal strength
-            latest_strength = crossover_data['signal_strength'].iloc[-1]
-            latest_crossover_type = crossover_data['crossover_type'].iloc[-1]
+            latest_strength = crossover_data['signal_strength'].iat[-1]
+            latest_crossover_type = crossover_data['crossover_type'].iat[-1]
             
             # Adjust strength based on crossover type
             if latest_crossover_type in ['bullish', 'bearish']:
@@ -275,7 +278,7 @@ class EMACrossoverStrategy(StrategyInterface):
                 data, self.short_period, self.long_period, self.approach_threshold
             )
             
-            return crossover_data['crossover_type'].iloc[-1]
+            return crossover_data['crossover_type'].iat[-1]
             
         except Exception as e:
             self.logger.error(f"Crossover type detection failed: {e}")
@@ -297,9 +300,9 @@ class EMACrossoverStrategy(StrategyInterface):
             )
             
             return {
-                'short_ema': crossover_data['short_ema'].iloc[-1],
-                'long_ema': crossover_data['long_ema'].iloc[-1],
-                'convergence_pct': crossover_data['ema_convergence'].iloc[-1],
+                'short_ema': crossover_data['short_ema'].iat[-1],
+                'long_ema': crossover_data['long_ema'].iat[-1],
+                'convergence_pct': crossover_data['ema_convergence'].iat[-1],
                 'short_period': self.short_period,
                 'long_period': self.long_period
             }
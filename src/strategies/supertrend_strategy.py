@@ -50,7 +50,8 @@ class SuperTrendStrategy(StrategyInterface):
         
         Args:
             data: DataFrame with OHLCV data
-            indicators: Dictionary of calculated indicators (can be empty, will calculate SuperTrend)
+            indicators: Dictionary of calculated indicators; a precomputed ATR series is
+                used from the 'atr_<period>' key, otherwise it is calculated
             
         Returns:
             Signal object with trading recommendation
@@ -62,23 +63,24 @@ class SuperTrendStrategy(StrategyInterface):
             if data.empty:
                 raise StrategyError("No data provided for signal generation")
             
-            # Get the latest data point
-            latest_data = data.iloc[-1]
+            # Get the latest data point without building a row Series
             latest_timestamp = data.index[-1]
-            symbol = getattr(latest_data, 'symbol', 'UNKNOWN')
+            symbol = data['symbol'].iat[-1] if 'symbol' in data.columns else 'UNKNOWN'
             
             # Calculate SuperTrend with signals
+            indicators = indicators or {}
             supertrend_data = self.supertrend_calculator.calculate_with_signals(
-                data, {'atr_period': self.atr_period, 'multiplier': self.multiplier}
+                data, {'atr_period': self.atr_period, 'multiplier': self.multiplier},
+                atr=indicators.get(f'atr_{self.atr_period}')
             )
             
             # Get latest SuperTrend information
-            latest_signal = supertrend_data['signals'].iloc[-1]
-            latest_trend = supertrend_data['trend_direction'].iloc[-1]
-            latest_supertrend = supertrend_data['supertrend'].iloc[-1]
-            latest_atr = supertrend_data['atr'].iloc[-1]
+            latest_signal = supertrend_data['signals'].iat[-1]
+            latest_trend = supertrend_data['trend_direction'].iat[-1]
+            latest_supertrend = supertrend_data['supertrend'].iat[-1]
+            latest_atr = supertrend_data['atr'].iat[-1]
             
-            current_price = latest_data['Close']
+            current_price = data['Close'].iat[-1]
             
             # Calculate trend strength
             trend_strength = self.supertrend_calculator.get_current_trend_strength(
@@ -123,9 +125,8 @@ class SuperTrendStrategy(StrategyInterface):
                 strategy_name=self.strategy_name
             )
             
-            self.logger.debug(f"Generated {signal_type.value} signal for {symbol} "
-                            f"(trend: {latest_trend}, strength: {trend_strength:.2f}) "
-                            f"with confidence {confidence:.2f}")
+            self.logger.debug("Generated %s signal for %s (trend: %s, strength: %.2f) with confidence %.2f",
+                              signal_type.value, symbol, latest_trend, trend_strength, confidence)
             return signal
             
         except Exception as e:
@@ -248,7 +249,7 @@ class SuperTrendStrategy(StrategyInterface):
             )
             
             # Check for recent trend reversal
-            latest_signal = supertrend_data['signals'].iloc[-1]
+            latest_signal = supertrend_data['signals'].iat[-1]
             if latest_signal != 0:
                 return min(1.0, trend_strength + 0.3)  # Boost for reversal signals
             
@@ -276,8 +277,8 @@ class SuperTrendStrategy(StrategyInterface):
             trend_changes = self.supertrend_calculator.detect_trend_changes(supertrend_data)
             
             # Get latest trend information
-            latest_trend = supertrend_data['trend_direction'].iloc[-1]
-            latest_signal = supertrend_data['signals'].iloc[-1]
+            latest_trend = supertrend_data['trend_direction'].iat[-1]
+            latest_signal = supertrend_data['signals'].iat[-1]
             
             return {
                 'current_trend': latest_trend,
@@ -306,9 +307,9 @@ class SuperTrendStrategy(StrategyInterface):
             )
             
             return {
-                'supertrend_value': supertrend_data['supertrend'].iloc[-1],
-                'trend_direction': supertrend_data['trend_direction'].iloc[-1],
-                'atr_value': supertrend_data['atr'].iloc[-1],
+                'supertrend_value': supertrend_data['supertrend'].iat[-1],
+                'trend_direction': supertrend_data['trend_direction'].iat[-1],
+                'atr_value': supertrend_data['atr'].iat[-1],
                 'atr_period': self.atr_period,
                 'multiplier': self.multiplier
             }
@@ -335,8 +336,8 @@ class SuperTrendStrategy(StrategyInterface):
                 data, {'atr_period': self.atr_period, 'multiplier': self.multiplier}
             )
             
-            current_price = data['Close'].iloc[-1]
-            current_supertrend = supertrend_data['supertrend'].iloc[-1]
+            current_price = data['Close'].iat[-1]
+            current_supertrend = supertrend_data['supertrend'].iat[-1]
             
             return current_price > current_supertrend
             
@@ -359,10 +360,10 @@ class SuperTrendStrategy(StrategyInterface):
                 data, {'atr_period': self.atr_period, 'multiplier': self.multiplier}
             )
             
-            current_price = data['Close'].iloc[-1]
-            current_supertrend = supertrend_data['supertrend'].iloc[-1]
-            current_atr = supertrend_data['atr'].iloc[-1]
-            current_trend = supertrend_data['trend_direction'].iloc[-1]
+            current_price = data['Close'].iat[-1]
+            current_supertrend = supertrend_data['supertrend'].iat[-1]
+            current_atr = supertrend_data['atr'].iat[-1]
+            current_trend = supertrend_data['trend_direction'].iat[-1]
             
             # Calculate distance from SuperTrend as percentage of ATR
             distance = (current_price - current_supertrend) / current_atr
@@ -0,0 +1,147 @@
+"""
+Exponentially weighted moving averages on NumPy arrays.
+
+A numba kernel for ``ewm(span=..., adjust=False).mean()`` that runs several
+spans over several columns in one pass and can resume from a saved state.
+"""
+
+import numpy as np
+
+from src.utils._njit import njit
+
+
+def _span_alphas(spans):
+    """Convert EWM spans to smoothing factors exactly as pandas does."""
+    com = (np.asarray(spans, dtype=np.float64) - 1) / 2.0
+    return 1.0 / (1.0 + com)
+
+
+@njit(cache=True)
+def _ewm_multi(values, alphas, weighted, old_wt):
+    """
+    Run several EWM means over every column of a 2-D array in a single pass.
+    
+    Mirrors pandas ``ewm(span=..., adjust=False).mean()`` (ignore_na=False),
+    including the handling of leading and interior NaNs. adjust=False is a
+    plain recurrence, so a pass can resume where a previous one stopped: the
+    running state is kept in weighted and old_wt, which are updated in place.
+    
+    Args:
+        values: (n, m) float64 array, one series per column
+        alphas: float64 array of smoothing factors, one per output block
+        weighted: (len(alphas), m) running means, NaN before the first value
+        old_wt: (len(alphas), m) weights of the running means, initially 1.0
+        
+    Returns:
+        (len(alphas), n, m) float64 array
+    """
+    n, m = values.shape
+    k = len(alphas)
+    out = np.empty((k, n, m), dtype=np.float64)
+    
+    for i in range(n):
+        for c in range(m):
+            cur = values[i, c]
+            is_observation = cur == cur
+            for j in range(k):
+                if weighted[j, c] == weighted[j, c]:
+                    old_wt[j, c] *= 1.0 - alphas[j]
+                    if is_observation:
+                        if weighted[j, c] != cur:
+                            weighted[j, c] = (old_wt[j, c] * weighted[j, c] + alphas[j] * cur) / (old_wt[j, c] + alphas[j])
+                        old_wt[j, c] = 1.0
+                elif is_observation:
+                    weighted[j, c] = cur
+                out[j, i, c] = weighted[j, c]
+    
+    return out
+
+
+def ewm_state(spans, columns=1):
+    """Fresh (weighted, old_wt) state for _ewm_multi."""
+    return np.full((len(spans), columns), np.nan), np.ones((len(spans), columns))
+
+
+def ewm_spans(values, spans, state=None):
+    """
+    EWM means of a 1-D or (dates x symbols) array, stacked as (len(spans),) + values.shape.
+    
+    Pass the state from ewm_state (or a previous call) to resume a recurrence;
+    it is updated in place to the last row of values.
+    """
+    flat = values.reshape(len(values), -1)
+    if state is None:
+        state = ewm_state(spans, flat.shape[1])
+    out = _ewm_multi(flat, _span_alphas(spans), *state)
+    return out.reshape((len(spans),) + values.shape)
+
+
+@njit(cache=True, error_model='numpy')
+def _rsi_multi(values, prev, alphas, gain_w, gain_wt, loss_w, loss_wt):
+    """
+    RSI for several spans over every column of a 2-D array in a single pass.
+    
+    The price change, its gain/loss split, both EWM recurrences and the RSI
+    itself are computed per element, so no delta, gain, loss or average
+    arrays are materialized. Matches running _ewm_multi over the gains and
+    losses of ``np.diff`` (NaN changes count as 0), with RSI 50 where it is
+    undefined.
+    
+    Args:
+        values: (n, m) float64 array, one series per column
+        prev: (m,) closes before values[0] (values[0] itself for a fresh start)
+        alphas: float64 array of smoothing factors, one per output block
+        gain_w, gain_wt: running average gains and their weights, updated in place
+        loss_w, loss_wt: running average losses and their weights, updated in place
+        
+    Returns:
+        (len(alphas), n, m) float64 array
+    """
+    n, m = values.shape
+    k = len(alphas)
+    out = np.empty((k, n, m), dtype=np.float64)
+    last = prev.copy()
+    
+    for i in range(n):
+        for c in range(m):
+            delta = values[i, c] - last[c]
+            last[c] = values[i, c]
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            for j in range(k):
+                # Gains and losses are never NaN, so every step is an observation
+                if gain_w[j, c] == gain_w[j, c]:
+                    gain_wt[j, c] *= 1.0 - alphas[j]
+                    if gain_w[j, c] != gain:
+                        gain_w[j, c] = (gain_wt[j, c] * gain_w[j, c] + alphas[j] * gain) / (gain_wt[j, c] + alphas[j])
+                    gain_wt[j, c] = 1.0
+                else:
+                    gain_w[j, c] = gain
+                if loss_w[j, c] == loss_w[j, c]:
+                    loss_wt[j, c] *= 1.0 - alphas[j]
+                    if loss_w[j, c] != loss:
+                        loss_w[j, c] = (loss_wt[j, c] * loss_w[j, c] + alphas[j] * loss) / (loss_wt[j, c] + alphas[j])
+                    loss_wt[j, c] = 1.0
+                else:
+                    loss_w[j, c] = loss
+                
+                rsi = 100 - (100 / (1 + gain_w[j, c] / loss_w[j, c]))
+                out[j, i, c] = rsi if rsi == rsi else 50.0
+    
+    return out
+
+
+def ewm_rsi(values, spans, state=None, prev=None):
+    """
+    RSI of a 1-D or (dates x symbols) array, stacked as (len(spans),) + values.shape.
+    
+    Average gains and losses are EWM means with the given spans. state is an
+    optional (gains, losses) pair of ewm_state states to resume from, updated
+    in place, and prev the close before values[0] when resuming.
+    """
+    flat = values.reshape(len(values), -1)
+    if state is None:
+        state = (ewm_state(spans, flat.shape[1]), ewm_state(spans, flat.shape[1]))
+    start = flat[0] if prev is None else np.asarray(prev, dtype=np.float64).reshape(-1)
+    out = _rsi_multi(flat, start, _span_alphas(spans), *state[0], *state[1])
+    return out.reshape((len(spans),) + values.shape)
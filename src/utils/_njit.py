@@ -0,0 +1,46 @@
+"""
+Optional numba JIT support.
+
+Provides an ``njit`` decorator that compiles with numba when it is installed
+and otherwise returns the function unchanged, so kernels still run as plain
+Python/NumPy code.
+"""
+
+try:
+    from numba import njit as _numba_njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    _numba_njit = None
+    NUMBA_AVAILABLE = False
+
+
+def njit(*args, **kwargs):
+    """
+    JIT-compile a function with numba if available.
+
+    Supports both the bare ``@njit`` and the ``@njit(cache=True, ...)`` forms.
+    Without numba the decorated function is returned unchanged.
+    """
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return _compile(args[0], (), {})
+
+    def decorator(func):
+        return _compile(func, args, kwargs)
+
+    return decorator
+
+
+def _compile(func, args, kwargs):
+    """Compile func with numba, retrying without on-disk caching if needed."""
+    if not NUMBA_AVAILABLE:
+        return func
+
+    try:
+        return _numba_njit(*args, **kwargs)(func)
+    except RuntimeError:
+        # Caching needs a writable location next to the source file, which
+        # frozen (PyInstaller) builds do not have
+        if not kwargs.get('cache'):
+            raise
+        kwargs = dict(kwargs, cache=False)
+        return _numba_njit(*args, **kwargs)(func)
@@ -0,0 +1,57 @@
+"""
+Rolling window statistics on NumPy arrays.
+
+O(N) prefix-sum versions of pandas ``rolling(window).mean()`` / ``.std()``
+that work on 1-D arrays or (dates x symbols) blocks.
+"""
+
+import numpy as np
+
+
+def rolling_mean_std(values, period):
+    """
+    Rolling mean and sample std of a 1-D or (dates x symbols) array from cumulative sums.
+    
+    Values are centred on their column mean first so the sum-of-squares
+    identity does not lose precision on large prices. Windows that contain a
+    NaN, like the leading period - 1 rows, come out as NaN.
+    """
+    n = len(values)
+    valid = ~np.isnan(values)
+    
+    centered = np.nan_to_num(values, nan=0.0)
+    shift = centered.sum(axis=0) / np.maximum(valid.sum(axis=0), 1)
+    centered -= shift
+    centered[~valid] = 0.0
+    
+    # Prefix sums with a leading zero row, so window sums are plain differences
+    sums = np.empty((n + 1,) + values.shape[1:])
+    sums[0] = 0.0
+    np.cumsum(centered, axis=0, out=sums[1:])
+    np.square(centered, out=centered)
+    squares = np.empty_like(sums)
+    squares[0] = 0.0
+    np.cumsum(centered, axis=0, out=squares[1:])
+    
+    window_sum = sums[period:] - sums[:-period]
+    mean = window_sum / period
+    var = squares[period:] - squares[:-period]
+    var -= window_sum * mean
+    var /= period - 1
+    std = np.sqrt(np.maximum(var, 0.0))
+    mean += shift
+    
+    # Flat windows (e.g. suspended stocks) get an exact zero like pandas, not rounding noise
+    moves = np.zeros((n,) + values.shape[1:])
+    np.cumsum(values[1:] != values[:-1], axis=0, out=moves[1:])
+    std[(moves[period - 1:] - moves[:n - period + 1]) == 0] = 0.0
+    
+    if not valid.all():
+        missing = np.zeros((n + 1,) + values.shape[1:])
+        np.cumsum(~valid, axis=0, out=missing[1:])
+        has_nan = (missing[period:] - missing[:-period]) > 0
+        mean[has_nan] = np.nan
+        std[has_nan] = np.nan
+    
+    pad = np.full((min(period - 1, n),) + values.shape[1:], np.nan)
+    return np.concatenate([pad, mean]), np.concatenate([pad, std])
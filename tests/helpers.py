@@ -0,0 +1,24 @@
+"""
+Shared fixtures for the data fetching tests
+"""
+
+import pandas as pd
+import numpy as np
+
+
+def make_download(symbols, periods=300):
+    """Build a yf.download-style frame grouped by ticker."""
+    dates = pd.date_range(start='2020-01-01', periods=periods, freq='B')
+    np.random.seed(42)  # For reproducible tests
+
+    frames = {}
+    for symbol in symbols:
+        close = 1000 + np.cumsum(np.random.normal(0, 5, len(dates)))
+        frames[symbol] = pd.DataFrame({
+            'Open': close * 0.99,
+            'High': close * 1.01,
+            'Low': close * 0.98,
+            'Close': close,
+            'Volume': np.random.randint(100000, 1000000, len(dates)).astype(float),
+        }, index=dates)
+    return pd.concat(frames, axis=1)
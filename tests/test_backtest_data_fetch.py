@@ -0,0 +1,163 @@
+"""
+Tests for the OHLCV and result caches in backtest_runner
+"""
+
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+import pandas as pd
+
+import backtest_runner as runner
+from tests.helpers import make_download
+
+
+class TestFetchHistoricalData(unittest.TestCase):
+    """Test cases for the stale cache top-up in fetch_historical_data."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_dir = patch.object(runner, 'OHLCV_CACHE_DIR', Path(self.temp_dir))
+        self.cache_dir.start()
+        self.cache_path = runner._ohlcv_cache_path('AAA.NS', '2020-01-01')
+        logging.getLogger('backtest_runner').setLevel(logging.WARNING)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.cache_dir.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def fetch(self, side_effect):
+        """Run fetch_historical_data for AAA.NS against mocked downloads."""
+        with patch.object(runner.yf, 'download', side_effect=side_effect) as download:
+            data = runner.fetch_historical_data(['AAA.NS'], '2020-01-01', min_threshold=100, cache='day')
+        return data, download
+
+    def test_stale_cache_fetches_only_new_bars(self):
+        """A stale cache should be extended from its last bar on."""
+        self.fetch([make_download(['AAA.NS'])])
+        os.utime(self.cache_path, (0, 0))
+
+        latest = make_download(['AAA.NS'], periods=305)
+        data, download = self.fetch([latest.iloc[299:]])
+
+        download.assert_called_once()
+        self.assertEqual(download.call_args.kwargs['start'], latest.index[299].strftime('%Y-%m-%d'))
+        pd.testing.assert_series_equal(data['AAA.NS']['Close'], latest['AAA.NS']['Close'], check_freq=False)
+        self.assertEqual(len(pd.read_parquet(self.cache_path)), 305)
+
+    def test_readjusted_history_is_refetched(self):
+        """A rescaled overlapping bar should replace the cache with a full download."""
+        self.fetch([make_download(['AAA.NS'])])
+        os.utime(self.cache_path, (0, 0))
+
+        adjusted = make_download(['AAA.NS'], periods=305) * 0.5
+        data, download = self.fetch([adjusted.iloc[299:], adjusted])
+
+        self.assertEqual(download.call_count, 2)
+        self.assertEqual(download.call_args.kwargs['start'], '2020-01-01')
+        pd.testing.assert_series_equal(data['AAA.NS']['Close'], adjusted['AAA.NS']['Close'], check_freq=False)
+        pd.testing.assert_series_equal(pd.read_parquet(self.cache_path)['Close'], adjusted['AAA.NS']['Close'],
+                                       check_freq=False)
+
+    def test_ungrouped_batch_fetches_symbols_individually(self):
+        """A flat multi-symbol download should not hand the same frame to every symbol."""
+        raw = make_download(['AAA.NS', 'BBB.NS'])
+        with patch.object(runner.yf, 'download', side_effect=[raw['AAA.NS'], raw['AAA.NS'], raw['BBB.NS']]) as download:
+            frames = runner._download_batch(['AAA.NS', 'BBB.NS'], '2020-01-01')
+
+        self.assertEqual([c.args[0] for c in download.call_args_list], [['AAA.NS', 'BBB.NS'], ['AAA.NS'], ['BBB.NS']])
+        pd.testing.assert_frame_equal(frames['AAA.NS'], raw['AAA.NS'])
+        pd.testing.assert_frame_equal(frames['BBB.NS'], raw['BBB.NS'])
+
+
+class TestBacktestResultCache(unittest.TestCase):
+    """Test cases for the cached backtest results."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_dir = patch.object(runner, 'BACKTEST_CACHE_DIR', Path(self.temp_dir))
+        self.cache_dir.start()
+        self.data = {'AAA.NS': make_download(['AAA.NS'])['AAA.NS']}
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.cache_dir.stop()
+        runner._code_fingerprint.cache_clear()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_code_change_invalidates_result(self):
+        """A cached result should only be reused while the backtest code is unchanged."""
+        engine = runner.BacktestEngine()
+        with patch.object(engine, 'run_backtest', side_effect=['first', 'second', 'third']) as run:
+            self.assertEqual(runner._run_backtest_cached(engine, self.data, None, {}, max_age=3600), 'first')
+            self.assertEqual(runner._run_backtest_cached(engine, self.data, None, {}, max_age=3600), 'first')
+
+            with patch.object(runner, '_code_fingerprint', return_value=b'changed'):
+                self.assertEqual(runner._run_backtest_cached(engine, self.data, None, {}, max_age=3600), 'second')
+
+        self.assertEqual(run.call_count, 2)
+
+    def test_kernel_change_invalidates_result(self):
+        """Editing a kernel under src/ should invalidate cached results."""
+        kernel = Path(self.temp_dir) / 'src' / 'utils' / '_ewm.py'
+        kernel.parent.mkdir(parents=True)
+        kernel.write_text("ALPHA = 0.5\n")
+        self.assertIn(Path(runner.__file__).parent / 'src', runner.BACKTEST_CODE_PATHS)
+
+        engine = runner.BacktestEngine()
+        with patch.object(runner, 'BACKTEST_CODE_PATHS', [kernel.parents[1]]), \
+                patch.object(engine, 'run_backtest', side_effect=['first', 'second']) as run:
+            runner._code_fingerprint.cache_clear()
+            self.assertEqual(runner._run_backtest_cached(engine, self.data, None, {}, max_age=3600), 'first')
+
+            kernel.write_text("ALPHA = 0.25\n")
+            runner._code_fingerprint.cache_clear()
+            self.assertEqual(runner._run_backtest_cached(engine, self.data, None, {}, max_age=3600), 'second')
+
+        self.assertEqual(run.call_count, 2)
+
+
+class TestStrategySignalCache(unittest.TestCase):
+    """Test cases for the per-bar strategy signal cache."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        runner._signal_cache.clear()
+        raw = make_download(['AAA.NS', 'BBB.NS'])
+        self.frames = {}
+        for symbol in ('AAA.NS', 'BBB.NS'):
+            self.frames[symbol] = raw[symbol].copy()
+            self.frames[symbol].attrs['symbol'] = symbol
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        runner._signal_cache.clear()
+
+    def test_keyed_by_symbol_and_bar(self):
+        """Signals should be reused per strategy, symbol and bar without colliding."""
+        strategy = runner.SuperTrendStrategy(10, 3.0)
+        key = ('supertrend', (('atr_period', 10), ('multiplier', 3.0)))
+        date = self.frames['AAA.NS'].index[200]
+
+        with patch.object(strategy, 'generate_signal', side_effect=lambda data, _: data['Close'].iat[-1]) as generate:
+            for _ in range(2):
+                for symbol, data in self.frames.items():
+                    self.assertEqual(runner._cached_strategy_signal(strategy, key, data.loc[:date].copy()),
+                                     data.loc[date, 'Close'])
+
+            # Frames without a symbol are always recalculated
+            anonymous = self.frames['AAA.NS'].loc[:date].copy()
+            anonymous.attrs.clear()
+            runner._cached_strategy_signal(strategy, key, anonymous)
+
+        self.assertEqual(generate.call_count, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,296 @@
+"""
+Tests for the batched data fetching in enhanced_multi_strategy_bot
+"""
+
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+import pandas as pd
+import numpy as np
+
+import enhanced_multi_strategy_bot as bot
+from tests.helpers import make_download
+
+
+class TestFetchAll(unittest.TestCase):
+    """Test cases for fetch_all."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = {'output': {'base_directory': self.temp_dir}}
+        self.logger = logging.getLogger('test_bot_data_fetch')
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_last_market_close(self):
+        """Last close should skip back over weekends and pre-close times."""
+        # Monday morning -> previous Friday's close
+        self.assertEqual(bot.last_market_close(datetime(2024, 1, 8, 10, 0)),
+                         datetime(2024, 1, 5, 15, 30))
+        # Tuesday evening -> same day's close
+        self.assertEqual(bot.last_market_close(datetime(2024, 1, 9, 18, 0)),
+                         datetime(2024, 1, 9, 15, 30))
+
+    def test_market_hours_use_ist(self):
+        """Market hours should be checked against the IST wall clock."""
+        self.assertTrue(bot._market_hours_at(datetime(2024, 1, 8, 9, 15)))
+        self.assertFalse(bot._market_hours_at(datetime(2024, 1, 8, 15, 31)))
+        self.assertFalse(bot._market_hours_at(datetime(2024, 1, 6, 11, 0)))
+
+        # 04:00 UTC is 09:30 IST, whatever the host timezone
+        utc_morning = bot.pytz.utc.localize(datetime(2024, 1, 8, 4, 0))
+        with patch.object(bot, 'datetime', wraps=datetime) as clock:
+            clock.now.side_effect = utc_morning.astimezone
+            self.assertEqual(bot.ist_now(), datetime(2024, 1, 8, 9, 30))
+            self.assertTrue(bot.is_market_hours())
+
+    @patch.object(bot, 'is_market_hours', return_value=False)
+    def test_batch_download_and_cache(self, _):
+        """Symbols should come from one batched download, then from the cache."""
+        symbols = ['AAA.NS', 'BBB.NS']
+        raw = make_download(symbols)
+
+        with patch.object(bot.yf, 'download', return_value=raw) as download:
+            fetched = bot.fetch_all(symbols, self.logger, self.config)
+        download.assert_called_once()
+
+        for symbol in symbols:
+            data, period_used = fetched[symbol]
+            pd.testing.assert_frame_equal(data, raw[symbol])
+            self.assertEqual(period_used, 'max')
+            self.assertTrue((Path(self.temp_dir) / 'cache' / f'{symbol}.parquet').exists())
+
+        with patch.object(bot.yf, 'download') as download:
+            cached = bot.fetch_all(symbols, self.logger, self.config)
+        download.assert_not_called()
+
+        for symbol in symbols:
+            data, period_used = cached[symbol]
+            pd.testing.assert_frame_equal(data, raw[symbol], check_freq=False)
+            self.assertEqual(period_used, 'cached')
+
+    @patch.object(bot, 'is_market_hours', return_value=False)
+    def test_stale_cache_fetches_only_new_bars(self, _):
+        """An outdated cache should be extended with the bars since its last date."""
+        symbols = ['AAA.NS']
+        cache_path = Path(self.temp_dir) / 'cache' / 'AAA.NS.parquet'
+
+        with patch.object(bot.yf, 'download', return_value=make_download(symbols)):
+            bot.fetch_all(symbols, self.logger, self.config)
+        os.utime(cache_path, (0, 0))
+
+        latest = make_download(symbols, periods=305)
+        with patch.object(bot.yf, 'download', return_value=latest.iloc[299:]) as download:
+            fetched = bot.fetch_all(symbols, self.logger, self.config)
+
+        download.assert_called_once()
+        self.assertEqual(download.call_args.kwargs['start'], latest.index[299].date())
+        data, period_used = fetched['AAA.NS']
+        self.assertEqual(period_used, 'incremental')
+        pd.testing.assert_series_equal(data['Close'], latest['AAA.NS']['Close'], check_freq=False)
+        self.assertEqual(len(pd.read_parquet(cache_path)), 305)
+
+        # Rescaled history (split/dividend adjustment) forces a full download
+        os.utime(cache_path, (0, 0))
+        adjusted = latest * 0.5
+        with patch.object(bot.yf, 'download', side_effect=[adjusted.iloc[304:], adjusted]) as download:
+            fetched = bot.fetch_all(symbols, self.logger, self.config)
+
+        self.assertEqual(download.call_count, 2)
+        self.assertEqual(fetched['AAA.NS'][1], 'max')
+
+    @patch.object(bot, 'is_market_hours', return_value=True)
+    def test_missing_symbol_falls_back(self, _):
+        """Symbols missing from the batch should use the per-symbol fetch."""
+        raw = make_download(['AAA.NS'])
+        fallback = raw['AAA.NS']
+
+        with patch.object(bot.yf, 'download', return_value=raw), \
+                patch.object(bot, 'fetch_symbol_history', return_value=(fallback, '5y')) as history:
+            fetched = bot.fetch_all(['AAA.NS', 'BBB.NS'], self.logger, self.config)
+
+        history.assert_called_once()
+        self.assertEqual(fetched['BBB.NS'][1], '5y')
+
+    @patch.object(bot, 'is_market_hours', return_value=False)
+    def test_fallback_history_is_cached_tz_naive(self, _):
+        """Ticker.history frames should be cached so later batch downloads can extend them."""
+        latest = make_download(['AAA.NS'], periods=305)
+        history = latest['AAA.NS'].iloc[:300].tz_localize('Asia/Kolkata')
+        cache_path = Path(self.temp_dir) / 'cache' / 'AAA.NS.parquet'
+
+        with patch.object(bot.yf, 'download', return_value=pd.DataFrame()), \
+                patch.object(bot, 'fetch_symbol_history', return_value=(history, 'max')):
+            fetched = bot.fetch_all(['AAA.NS'], self.logger, self.config)
+
+        self.assertIsNone(fetched['AAA.NS'][0].index.tz)
+        os.utime(cache_path, (0, 0))
+
+        with patch.object(bot.yf, 'download', return_value=latest.iloc[299:]):
+            fetched = bot.fetch_all(['AAA.NS'], self.logger, self.config)
+
+        self.assertEqual(fetched['AAA.NS'][1], 'incremental')
+        self.assertEqual(len(fetched['AAA.NS'][0]), 305)
+
+    @patch.object(bot, 'is_market_hours', return_value=True)
+    def test_ungrouped_batch_falls_back(self, _):
+        """A flat multi-symbol download should not hand the same frame to every symbol."""
+        raw = make_download(['AAA.NS', 'BBB.NS'])
+
+        with patch.object(bot.yf, 'download', return_value=raw['AAA.NS']), \
+                patch.object(bot, 'fetch_symbol_history', side_effect=[(raw['AAA.NS'], '5y'), (raw['BBB.NS'], '5y')]) as history:
+            fetched = bot.fetch_all(['AAA.NS', 'BBB.NS'], self.logger, self.config)
+
+        self.assertEqual(history.call_count, 2)
+        pd.testing.assert_frame_equal(fetched['BBB.NS'][0], raw['BBB.NS'])
+
+    @patch.object(bot, 'is_market_hours', return_value=True)
+    def test_short_history_skips_fallback(self, _):
+        """A symbol the 'max' batch returned too few bars for should not be refetched."""
+        raw = make_download(['AAA.NS', 'BBB.NS'])
+        raw.loc[raw.index[:150], 'BBB.NS'] = np.nan
+
+        with patch.object(bot.yf, 'download', return_value=raw), \
+                patch.object(bot, 'fetch_symbol_history') as history:
+            fetched = bot.fetch_all(['AAA.NS', 'BBB.NS'], self.logger, self.config)
+
+        history.assert_not_called()
+        self.assertNotIn('BBB.NS', fetched)
+
+
+class TestFetchSymbolHistory(unittest.TestCase):
+    """Test cases for the per-symbol fallback fetch."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        bot.get_ticker.cache_clear()
+        self.logger = logging.getLogger('test_bot_data_fetch')
+        self.periods = ['max', '10y', '5y']
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        bot.get_ticker.cache_clear()
+
+    @unittest.skipUnless(bot.TICKER_MISSING_ERRORS, "yfinance has no typed missing-ticker errors")
+    def test_missing_symbol_stops_fallback(self):
+        """A missing-ticker error should skip the remaining periods."""
+        with patch.object(bot.yf, 'Ticker') as ticker_cls:
+            ticker_cls.return_value.history.side_effect = bot.YFTzMissingError('BAD.NS')
+            data, period_used = bot.fetch_symbol_history('BAD.NS', self.logger, self.periods, 200)
+
+        self.assertIsNone(period_used)
+        ticker_cls.return_value.history.assert_called_once()
+
+    def test_other_errors_try_next_period(self):
+        """Transient errors should still walk the fallback periods."""
+        history = make_download(['AAA.NS'])['AAA.NS']
+
+        with patch.object(bot.yf, 'Ticker') as ticker_cls:
+            ticker_cls.return_value.history.side_effect = [ConnectionError('timeout'), history]
+            data, period_used = bot.fetch_symbol_history('AAA.NS', self.logger, self.periods, 200)
+            bot.fetch_symbol_history('AAA.NS', self.logger, self.periods[1:], 200)
+
+        self.assertEqual(period_used, '10y')
+        ticker_cls.assert_called_once_with('AAA.NS')
+
+    def test_short_history_skips_shorter_periods(self):
+        """Periods shorter than one that already came back short should be skipped."""
+        history = make_download(['AAA.NS'])['AAA.NS']
+
+        with patch.object(bot.yf, 'Ticker') as ticker_cls:
+            ticker_cls.return_value.history.return_value = history.iloc[:100]
+            data, period_used = bot.fetch_symbol_history('AAA.NS', self.logger, ['5y', 'max', '2y', '1y'], 200)
+
+        self.assertIsNone(period_used)
+        self.assertEqual([c.kwargs['period'] for c in ticker_cls.return_value.history.call_args_list],
+                         ['5y', 'max'])
+
+
+class TestSignalCache(unittest.TestCase):
+    """Test cases for the per-bar analysis cache."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = {'output': {'base_directory': self.temp_dir}}
+        self.data = make_download(['AAA.NS'])['AAA.NS']
+        self.next_data = make_download(['AAA.NS'], periods=301)['AAA.NS']
+        self.result = {'symbol': 'AAA.NS', 'timestamp': datetime(2024, 1, 5, 16, 0),
+                       'legacy_signal': 'BUY', 'legacy_score': 40, 'strategy_signals': {},
+                       'composite_signal': 'BUY', 'composite_score': 50.0}
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def load(self, data, config):
+        """Load a cached result, dropping the refreshed timestamp."""
+        cached = bot.load_cached_signal('AAA.NS', data, config)
+        if cached is None:
+            return None
+        result, composite_signal = cached
+        self.assertGreater(result.pop('timestamp'), self.result['timestamp'])
+        return dict(result, timestamp=self.result['timestamp']), composite_signal
+
+    @patch.object(bot, 'is_market_hours', return_value=False)
+    def test_round_trip_after_close(self, _):
+        """A saved result should load back for the same history, config and code only."""
+        bot.save_cached_signal(self.result, self.data, self.config, 'composite')
+
+        self.assertEqual(self.load(self.data, self.config), (self.result, 'composite'))
+        self.assertIsNone(self.load(self.next_data, self.config))
+        self.assertIsNone(self.load(self.data * 0.5, self.config))
+
+        changed = dict(self.config, strategies={'supertrend': {'multiplier': 2.0}})
+        self.assertIsNone(self.load(self.data, changed))
+
+        with patch.object(bot, 'code_hash', return_value='upgraded'):
+            self.assertIsNone(self.load(self.data, self.config))
+
+    @patch.object(bot, 'is_market_hours', return_value=False)
+    def test_newer_bar_keeps_other_configs(self, _):
+        """Saving a newer bar should only evict older entries for the same config."""
+        other = dict(self.config, strategies={'supertrend': {'multiplier': 2.0}})
+
+        bot.save_cached_signal(self.result, self.data, self.config)
+        bot.save_cached_signal(self.result, self.next_data, other)
+        self.assertEqual(self.load(self.data, self.config), (self.result, None))
+
+        bot.save_cached_signal(self.result, self.next_data, self.config)
+        self.assertIsNone(self.load(self.data, self.config))
+        self.assertEqual(self.load(self.next_data, other), (self.result, None))
+
+    def test_ignored_during_market_hours(self):
+        """Intraday results should neither be stored nor reused."""
+        with patch.object(bot, 'is_market_hours', return_value=False):
+            bot.save_cached_signal(self.result, self.data, self.config)
+
+        with patch.object(bot, 'is_market_hours', return_value=True):
+            self.assertIsNone(bot.load_cached_signal('AAA.NS', self.data, self.config))
+
+    @patch.object(bot, 'is_market_hours', return_value=False)
+    def test_cache_hit_still_publishes(self, _):
+        """A cached analysis should still reach the email and chart outputs."""
+        bot.save_cached_signal(self.result, self.data, self.config, 'composite')
+        logger = logging.getLogger('test_bot_data_fetch')
+
+        with patch.object(bot, 'publish_signal_outputs', return_value='chart.png') as publish:
+            result, composite_signal = bot.analyze_symbol_multi_strategy(
+                'AAA.NS', logger, self.config, data=self.data, return_composite=True)
+
+        publish.assert_called_once()
+        self.assertEqual(publish.call_args.args[3], 'composite')
+        self.assertEqual(composite_signal, 'composite')
+        self.assertEqual(result['chart_path'], 'chart.png')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+"""
+Tests for the indicator helpers in enhanced_multi_strategy_bot
+"""
+
+import unittest
+from unittest.mock import patch
+import pandas as pd
+import numpy as np
+
+import enhanced_multi_strategy_bot as bot
+from src.analysis.supertrend_calculator import SuperTrendCalculator
+from src.strategies.ema_crossover_strategy import EMACrossoverStrategy
+from src.strategies.supertrend_strategy import SuperTrendStrategy
+
+
+class TestBotIndicators(unittest.TestCase):
+    """Test cases for the legacy indicator helpers."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        dates = pd.date_range(start='2015-01-01', periods=1500, freq='B')
+        np.random.seed(42)  # For reproducible tests
+
+        prices = 1000 + np.cumsum(np.random.normal(0, 5, len(dates)))
+        self.prices = pd.Series(prices, index=dates)
+
+    def test_bollinger_bands_match_pandas(self):
+        """Fast Bollinger Bands path should match pandas rolling mean/std."""
+        upper, middle, lower = bot.calculate_bollinger_bands(self.prices)
+
+        sma = self.prices.rolling(window=20).mean()
+        std = self.prices.rolling(window=20).std()
+
+        pd.testing.assert_series_equal(middle, sma, check_names=False)
+        pd.testing.assert_series_equal(upper, sma + 2 * std, check_names=False)
+        pd.testing.assert_series_equal(lower, sma - 2 * std, check_names=False)
+
+    def test_bollinger_bands_without_talib(self):
+        """Bollinger Bands should fall back to pandas when TA-Lib is missing."""
+        with patch.object(bot, 'talib', None):
+            upper, middle, lower = bot.calculate_bollinger_bands(self.prices)
+
+        self.assertEqual(middle.isna().sum(), 19)
+        self.assertTrue((upper.dropna() >= lower.dropna()).all())
+
+    def test_bollinger_bands_cumsum_matches_pandas(self):
+        """Cumulative-sum Bollinger Bands should match pandas, including NaN and flat windows."""
+        closes = pd.DataFrame({'A': self.prices, 'B': self.prices.to_numpy()[::-1]},
+                              index=self.prices.index)
+        closes.iloc[[0, 50, 51], 0] = np.nan
+        closes.iloc[100:140, 1] = 1000.0
+
+        upper, middle, lower = bot.calculate_bollinger_bands(closes)
+
+        sma = closes.rolling(window=20).mean()
+        std = closes.rolling(window=20).std()
+
+        pd.testing.assert_frame_equal(middle, sma)
+        pd.testing.assert_frame_equal(upper, sma + 2 * std)
+        pd.testing.assert_frame_equal(lower, sma - 2 * std)
+
+    def test_multiple_rsi_matches_pandas(self):
+        """Fused RSI kernel should reproduce the pandas ewm calculation."""
+        prices = self.prices.copy()
+        prices.iloc[[0, 100, 101]] = np.nan
+
+        rsi_values = bot.calculate_multiple_rsi(prices)
+
+        for period in [14, 21, 50]:
+            delta = prices.diff()
+            gains = delta.where(delta > 0, 0)
+            losses = -delta.where(delta < 0, 0)
+            rs = gains.ewm(span=period, adjust=False).mean() / losses.ewm(span=period, adjust=False).mean()
+            expected = (100 - (100 / (1 + rs))).fillna(50)
+
+            pd.testing.assert_series_equal(rsi_values[f'RSI_{period}'], expected,
+                                           check_names=False)
+
+    def test_trend_indicators_match_pandas(self):
+        """Fused EMA/MACD kernel should reproduce the pandas ewm calculation."""
+        ema_values, (macd, signal, histogram) = bot.calculate_trend_indicators(self.prices)
+
+        for period in [9, 21, 50, 200]:
+            pd.testing.assert_series_equal(ema_values[f'EMA_{period}'],
+                                           self.prices.ewm(span=period, adjust=False).mean())
+
+        expected_macd = self.prices.ewm(span=12, adjust=False).mean() - self.prices.ewm(span=26, adjust=False).mean()
+        expected_signal = expected_macd.ewm(span=9, adjust=False).mean()
+
+        pd.testing.assert_series_equal(macd, expected_macd)
+        pd.testing.assert_series_equal(signal, expected_signal)
+        pd.testing.assert_series_equal(histogram, expected_macd - expected_signal)
+
+    def test_indicators_accept_symbol_frames(self):
+        """EWM helpers should work column-wise on (dates x symbols) frames."""
+        closes = pd.DataFrame({'A': self.prices, 'B': self.prices[::-1].to_numpy()},
+                              index=self.prices.index)
+
+        ema_values = bot.calculate_multiple_ema(closes)
+        rsi_values = bot.calculate_multiple_rsi(closes)
+
+        pd.testing.assert_frame_equal(ema_values['EMA_50'], closes.ewm(span=50, adjust=False).mean())
+        for symbol in closes.columns:
+            expected = bot.calculate_multiple_rsi(closes[symbol])['RSI_14']
+            pd.testing.assert_series_equal(rsi_values['RSI_14'][symbol], expected, check_names=False)
+
+    def test_latest_values_resume_from_state(self):
+        """Resuming from a saved state should give the same values as a full recompute."""
+        full = {name: column[-1] for name, column in bot.calculate_legacy_indicators(self.prices).items()}
+
+        _, state = bot.latest_legacy_values(self.prices.iloc[:1400])
+        latest, new_state = bot.latest_legacy_values(self.prices, state, final_bars=1499)
+
+        self.assertEqual(new_state['bar'], self.prices.index[1498])
+        for name, value in full.items():
+            self.assertAlmostEqual(latest[name], value, places=3, msg=name)
+
+        # A revised close at the saved bar forces a full recompute
+        revised = self.prices * 0.5
+        latest, _ = bot.latest_legacy_values(revised, state)
+        self.assertAlmostEqual(latest['EMA_9'], full['EMA_9'] * 0.5, places=2)
+
+    def test_batch_scoring_matches_single_rows(self):
+        """Vectorized legacy scoring should agree with scoring each row on its own."""
+        rows = pd.DataFrame([
+            # Oversold in an uptrend below the lower band
+            [25, 30, 35, 105, 104, 103, 90, 106, 120, 107, 1.0, 0.5],
+            # Overbought in a downtrend with bearish momentum
+            [75, 70, 65, 95, 96, 97, 110, 94, 93, 80, -1.0, -0.5],
+            # Mixed readings
+            [50, 50, 50, 100, 100, 100, 100, 100, 110, 90, 0.0, 0.0],
+            # Missing values never score
+            [np.nan] * 12,
+        ], columns=bot.LEGACY_COLS)
+
+        signals, scores = bot.score_legacy_signals(rows)
+
+        self.assertEqual(list(signals), ['STRONG_BUY', 'STRONG_SELL', 'NO_SIGNAL', 'NO_SIGNAL'])
+        self.assertEqual(list(scores), [15, 15, 0, 0])
+        for i, row in rows.iterrows():
+            self.assertEqual(bot.score_legacy_signal(row.to_dict()), (signals[i], scores[i]))
+
+        # Random rows around every threshold, including inverted bands and gaps
+        np.random.seed(42)
+        random_rows = pd.DataFrame(np.random.uniform(0, 100, (2000, len(bot.LEGACY_COLS))),
+                                   columns=bot.LEGACY_COLS)
+        random_rows[['MACD', 'MACD_Signal']] -= 50
+        random_rows = random_rows.mask(np.random.random(random_rows.shape) < 0.02)
+
+        signals, scores = bot.score_legacy_signals(random_rows)
+        for i, row in enumerate(random_rows.to_dict('records')):
+            self.assertEqual(bot.score_legacy_signal(row), (signals[i], scores[i]))
+
+    def test_feature_bundle_matches_strategy_calculations(self):
+        """Precomputed EMA/ATR series should match what the strategies calculate themselves."""
+        data = pd.DataFrame({'High': self.prices * 1.01, 'Low': self.prices * 0.98, 'Close': self.prices})
+        strategies = {'ema_crossover': EMACrossoverStrategy(20, 50), 'supertrend': SuperTrendStrategy(10, 3.0)}
+
+        features = bot.build_feature_bundle(data, strategies)
+
+        self.assertEqual(sorted(features), ['atr_10', 'ema_20', 'ema_50'])
+        pd.testing.assert_series_equal(features['ema_50'], self.prices.ewm(span=50, adjust=False).mean(),
+                                       check_names=False)
+        pd.testing.assert_series_equal(features['atr_10'], SuperTrendCalculator()._calculate_atr(data, 10),
+                                       check_names=False)
+        for strategy in strategies.values():
+            self.assertEqual(strategy.generate_signal(data, features).signal_type,
+                             strategy.generate_signal(data, {}).signal_type)
+
+
+if __name__ == '__main__':
+    unittest.main()
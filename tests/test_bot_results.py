@@ -0,0 +1,67 @@
+"""
+Tests for saving results in enhanced_multi_strategy_bot
+"""
+
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+import pandas as pd
+
+import enhanced_multi_strategy_bot as bot
+
+
+class TestSaveEnhancedResults(unittest.TestCase):
+    """Test cases for save_enhanced_results."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.output_config = {'base_directory': self.temp_dir, 'signals_directory': 'signals'}
+        self.results = [
+            {
+                'symbol': 'AAA.NS', 'timestamp': datetime.now(), 'price': 101.5,
+                'legacy_signal': 'BUY', 'legacy_score': 40,
+                'composite_signal': 'BUY', 'composite_score': 55.0, 'composite_confidence': 0.7,
+                'strategy_signals': {'ema_crossover': {'signal': 'BUY', 'confidence': 0.8}},
+            },
+            {
+                'symbol': 'BBB.NS', 'timestamp': datetime.now(), 'price': 99.0,
+                'legacy_signal': 'SELL', 'legacy_score': -40,
+                'composite_signal': 'NO_SIGNAL', 'composite_score': 0.0, 'composite_confidence': 0.0,
+                'strategy_signals': {'supertrend': {'signal': 'SELL', 'confidence': 0.6}},
+            },
+        ]
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_parquet_with_flat_strategy_columns(self):
+        """Results should be written as Parquet with one column per strategy field."""
+        bot.save_enhanced_results(self.results, 'signals.parquet', self.output_config)
+
+        signals_dir = Path(self.temp_dir) / 'signals'
+        df = pd.read_parquet(signals_dir / 'signals.parquet')
+
+        self.assertEqual(list(df['symbol']), ['AAA.NS', 'BBB.NS'])
+        self.assertNotIn('strategy_signals', df.columns)
+        self.assertEqual(df['strategy_ema_crossover_signal'].iloc[0], 'BUY')
+        self.assertAlmostEqual(df['strategy_supertrend_confidence'].iloc[1], 0.6)
+        self.assertTrue(pd.isna(df['strategy_supertrend_signal'].iloc[0]))
+        self.assertEqual(list(df['signal_agreement']), ['AGREE', 'PARTIAL'])
+        self.assertIsInstance(df['composite_signal'].dtype, pd.CategoricalDtype)
+        self.assertFalse((signals_dir / 'signals.csv').exists())
+
+    def test_csv_copy_when_enabled(self):
+        """A CSV copy should only be written when write_csv is set."""
+        self.output_config['write_csv'] = True
+        bot.save_enhanced_results(self.results, 'signals.parquet', self.output_config)
+
+        df = pd.read_csv(Path(self.temp_dir) / 'signals' / 'signals.csv')
+        self.assertEqual(df['price_inr'].iloc[0], 'Rs.101.50')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,7 +10,7 @@ from datetime import datetime, timedelta
 from src.analysis.rsi_calculator import RSICalculator
 from src.analysis.bollinger_bands_calculator import BollingerBandsCalculator
 from src.analysis.ema_calculator import EMACalculator
-from src.analysis.supertrend_calculator import SuperTrendCalculator
+from src.analysis.supertrend_calculator import SuperTrendCalculator, _supertrend_loop
 from src.models.exceptions import IndicatorError
 
 
@@ -254,6 +254,25 @@ class TestIndicators(unittest.TestCase):
         # Strength should be between 0 and 1
         self.assertGreaterEqual(strength, 0.0)
         self.assertLessEqual(strength, 1.0)
+    
+    def test_supertrend_kernel_matches_python(self):
+        """Test compiled SuperTrend loop matches its pure Python version."""
+        atr = self.supertrend_calc._calculate_atr(self.test_data, 10)
+        args = (
+            self.test_data['High'].to_numpy(dtype=np.float64),
+            self.test_data['Low'].to_numpy(dtype=np.float64),
+            self.test_data['Close'].to_numpy(dtype=np.float64),
+            atr.to_numpy(dtype=np.float64),
+            3.0
+        )
+        
+        supertrend, trend = _supertrend_loop(*args)
+        py_func = getattr(_supertrend_loop, 'py_func', _supertrend_loop)
+        expected_supertrend, expected_trend = py_func(*args)
+        
+        np.testing.assert_allclose(supertrend, expected_supertrend, rtol=1e-12)
+        np.testing.assert_array_equal(trend, expected_trend)
+        self.assertTrue(set(np.unique(trend)) <= {-1, 1})
 
 
 if __name__ == '__main__':
@@ -13,6 +13,7 @@ from datetime import datetime, timedelta
 from pathlib import Path
 import json
 import yfinance as yf
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Optional
 
 # Import our modules
@@ -20,10 +21,10 @@ from nifty500_symbols import get_symbol_list
 from src.strategies.ema_crossover_strategy import EMACrossoverStrategy
 from src.strategies.supertrend_strategy import SuperTrendStrategy
 from src.strategies.multi_strategy_scorer import MultiStrategyScorer
-from enhanced_multi_strategy_bot import (
-    calculate_multiple_rsi, calculate_multiple_ema, 
-    calculate_bollinger_bands, calculate_macd, generate_legacy_signal
-)
+from enhanced_multi_strategy_bot import latest_legacy_values, score_legacy_signal, ANALYSIS_CHUNKSIZE
+
+# Symbols per price_data query, well below SQLite's bound-parameter limit
+SYMBOL_QUERY_BATCH_SIZE = 500
 
 
 def setup_logging():
@@ -42,9 +43,17 @@ def setup_logging():
 class DatabaseUpdater:
     """Updates the trading database with enhanced multi-strategy data."""
     
-    def __init__(self, db_path: str = "DBs/nifty500_trading_data.db"):
-        """Initialize database updater."""
+    def __init__(self, db_path: str = "DBs/nifty500_trading_data.db", workers: Optional[int] = None):
+        """
+        Initialize database updater.
+        
+        Args:
+            db_path: Path to the SQLite database
+            workers: Number of worker processes for indicator and signal
+                calculation (default: CPU count)
+        """
         self.db_path = Path(db_path)
+        self.workers = workers
         self.logger = logging.getLogger(__name__)
         
         # Initialize strategies
@@ -171,19 +180,22 @@ class DatabaseUpdater:
         
         total_processed = 0
         
-        for i, symbol in enumerate(symbols, 1):
+        # Read every symbol's price history in one pass over the database
+        all_price_data = self._get_price_data_for_symbols(symbols, limit_per_symbol)
+        
+        ready = []
+        for symbol in symbols:
+            price_data = all_price_data.get(symbol, pd.DataFrame())
+            if len(price_data) < 200:  # Need enough data for indicators
+                self.logger.warning(f"Insufficient data for {symbol}: {len(price_data)} records")
+                continue
+            ready.append((symbol, price_data))
+        
+        # Indicator math runs across worker processes; database writes stay in this one
+        computed = self._map_symbols(self._calculate_all_indicators, ready)
+        for i, (symbol, indicators_data) in enumerate(computed, 1):
             try:
-                self.logger.info(f"Processing {symbol} ({i}/{len(symbols)})...")
-                
-                # Get existing price data from database
-                price_data = self._get_price_data_from_db(symbol, limit_per_symbol)
-                
-                if len(price_data) < 200:  # Need enough data for indicators
-                    self.logger.warning(f"Insufficient data for {symbol}: {len(price_data)} records")
-                    continue
-                
-                # Calculate all indicators
-                indicators_data = self._calculate_all_indicators(symbol, price_data)
+                self.logger.info(f"Processing {symbol} ({i}/{len(ready)})...")
                 
                 # Store enhanced indicators
                 self._store_enhanced_indicators(symbol, indicators_data)
@@ -205,19 +217,22 @@ class DatabaseUpdater:
         
         signals_generated = 0
         
-        for i, symbol in enumerate(symbols, 1):
+        # Read every symbol's recent prices in one pass over the database
+        all_price_data = self._get_price_data_for_symbols(symbols, 500)
+        
+        ready = []
+        for symbol in symbols:
+            price_data = all_price_data.get(symbol, pd.DataFrame())
+            if len(price_data) < 200:
+                self.logger.warning(f"Insufficient data for {symbol}")
+                continue
+            ready.append((symbol, price_data))
+        
+        # Generate signals using our enhanced strategies across worker processes
+        computed = self._map_symbols(self._generate_enhanced_signals, ready)
+        for i, (symbol, signal_data) in enumerate(computed, 1):
             try:
-                self.logger.info(f"Generating signals for {symbol} ({i}/{len(symbols)})...")
-                
-                # Get recent price data
-                price_data = self._get_price_data_from_db(symbol, 500)
-                
-                if len(price_data) < 200:
-                    self.logger.warning(f"Insufficient data for {symbol}")
-                    continue
-                
-                # Generate signals using our enhanced strategies
-                signal_data = self._generate_enhanced_signals(symbol, price_data)
+                self.logger.info(f"Generating signals for {symbol} ({i}/{len(ready)})...")
                 
                 if signal_data:
                     self._store_enhanced_signal(signal_data)
@@ -229,6 +244,20 @@ class DatabaseUpdater:
         
         self.logger.info(f"Generated {signals_generated} enhanced signals")
     
+    def _map_symbols(self, func, ready: List[tuple]):
+        """
+        Run func(symbol, data) for each (symbol, data) pair in a process pool.
+        
+        Yields (symbol, result) pairs in input order as results arrive.
+        """
+        if not ready:
+            return
+        
+        symbols = [symbol for symbol, _ in ready]
+        frames = [data for _, data in ready]
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            yield from zip(symbols, executor.map(func, symbols, frames, chunksize=ANALYSIS_CHUNKSIZE))
+    
     def _get_price_data_from_db(self, symbol: str, limit: int) -> pd.DataFrame:
         """Get price data from database."""
         try:
@@ -260,45 +289,79 @@ class DatabaseUpdater:
             self.logger.error(f"Error getting price data for {symbol}: {e}")
             return pd.DataFrame()
     
+    def _get_price_data_for_symbols(self, symbols: List[str], limit: int) -> Dict[str, pd.DataFrame]:
+        """
+        Get the latest `limit` price rows for many symbols with one query per batch.
+        
+        Returns:
+            Dictionary mapping symbols to price DataFrames; symbols without
+            data are left out
+        """
+        result = {}
+        
+        try:
+            with sqlite3.connect(str(self.db_path)) as conn:
+                for start in range(0, len(symbols), SYMBOL_QUERY_BATCH_SIZE):
+                    batch = symbols[start:start + SYMBOL_QUERY_BATCH_SIZE]
+                    placeholders = ", ".join("?" * len(batch))
+                    query = f"""
+                        SELECT symbol, timestamp, open, high, low, close, volume
+                        FROM (
+                            SELECT symbol, timestamp, open, high, low, close, volume,
+                                   ROW_NUMBER() OVER (PARTITION BY symbol ORDER BY timestamp DESC) AS row_num
+                            FROM price_data
+                            WHERE symbol IN ({placeholders})
+                        )
+                        WHERE row_num <= ?
+                        ORDER BY symbol, timestamp
+                    """
+                    
+                    df = pd.read_sql_query(query, conn, params=(*batch, limit))
+                    if df.empty:
+                        continue
+                    
+                    # Convert timestamp and set as index
+                    df['timestamp'] = pd.to_datetime(df['timestamp'])
+                    
+                    for symbol, group in df.groupby('symbol', sort=False):
+                        frame = group.drop(columns='symbol').set_index('timestamp')
+                        
+                        # Rename columns to match yfinance format
+                        frame.columns = ['Open', 'High', 'Low', 'Close', 'Volume']
+                        result[symbol] = frame
+                
+        except Exception as e:
+            self.logger.error(f"Error getting price data for {len(symbols)} symbols: {e}")
+        
+        return result
+    
     def _calculate_all_indicators(self, symbol: str, data: pd.DataFrame) -> Dict:
         """Calculate all technical indicators for the data."""
         try:
-            # Calculate RSI
-            rsi_values = calculate_multiple_rsi(data['Close'])
-            
-            # Calculate EMAs
-            ema_values = calculate_multiple_ema(data['Close'])
-            
-            # Calculate Bollinger Bands
-            bb_upper, bb_middle, bb_lower = calculate_bollinger_bands(data['Close'])
-            
-            # Calculate MACD
-            macd, macd_signal, macd_histogram = calculate_macd(data['Close'])
+            # Only the latest value of each indicator is stored, so skip the full-length columns
+            latest, _ = latest_legacy_values(data['Close'])
             
             # Generate strategy signals
             ema_signal = self.ema_strategy.generate_signal(data, {})
             supertrend_signal = self.supertrend_strategy.generate_signal(data, {})
             
-            # Get the latest values
-            latest_idx = data.index[-1]
-            
             return {
-                'timestamp': latest_idx,
-                'ema_50': ema_values.get('EMA_50', pd.Series()).iloc[-1] if not ema_values.get('EMA_50', pd.Series()).empty else None,
-                'ema_200': ema_values.get('EMA_200', pd.Series()).iloc[-1] if not ema_values.get('EMA_200', pd.Series()).empty else None,
+                'timestamp': data.index[-1],
+                'ema_50': latest['EMA_50'],
+                'ema_200': latest['EMA_200'],
                 'ema_crossover_signal': ema_signal.signal_type.value if ema_signal else 'NO_SIGNAL',
                 'ema_crossover_confidence': ema_signal.confidence if ema_signal else 0.0,
                 'supertrend_signal': supertrend_signal.signal_type.value if supertrend_signal else 'NO_SIGNAL',
                 'supertrend_confidence': supertrend_signal.confidence if supertrend_signal else 0.0,
-                'rsi_14': rsi_values.get('RSI_14', pd.Series()).iloc[-1] if not rsi_values.get('RSI_14', pd.Series()).empty else None,
-                'rsi_21': rsi_values.get('RSI_21', pd.Series()).iloc[-1] if not rsi_values.get('RSI_21', pd.Series()).empty else None,
-                'rsi_50': rsi_values.get('RSI_50', pd.Series()).iloc[-1] if not rsi_values.get('RSI_50', pd.Series()).empty else None,
-                'bb_upper': bb_upper.iloc[-1] if not bb_upper.empty else None,
-                'bb_middle': bb_middle.iloc[-1] if not bb_middle.empty else None,
-                'bb_lower': bb_lower.iloc[-1] if not bb_lower.empty else None,
-                'macd': macd.iloc[-1] if not macd.empty else None,
-                'macd_signal': macd_signal.iloc[-1] if not macd_signal.empty else None,
-                'macd_histogram': macd_histogram.iloc[-1] if not macd_histogram.empty else None,
+                'rsi_14': latest['RSI_14'],
+                'rsi_21': latest['RSI_21'],
+                'rsi_50': latest['RSI_50'],
+                'bb_upper': latest['BB_Upper'],
+                'bb_middle': latest['BB_Middle'],
+                'bb_lower': latest['BB_Lower'],
+                'macd': latest['MACD'],
+                'macd_signal': latest['MACD_Signal'],
+                'macd_histogram': latest['MACD_Histogram'],
             }
             
         except Exception as e:
@@ -308,8 +371,10 @@ class DatabaseUpdater:
     def _generate_enhanced_signals(self, symbol: str, data: pd.DataFrame) -> Optional[Dict]:
         """Generate enhanced multi-strategy signals."""
         try:
-            # Generate legacy signal
-            legacy_signal, legacy_score = generate_legacy_signal(data)
+            # Generate legacy signal from the latest indicator values
+            latest, _ = latest_legacy_values(data['Close'])
+            latest['Close'] = data['Close'].to_numpy()[-1]
+            legacy_signal, legacy_score = score_legacy_signal(latest)
             
             # Generate strategy signals
             strategy_signals = []